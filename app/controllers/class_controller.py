@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import List
-from app.services.class_service import get_classes_by_profile_and_camera
-from app.schemas.class_schema import ClassResponse
+from app.services.class_service import get_classes_by_profile_and_camera, update_class_alert_settings
+from app.schemas.class_schema import ClassResponse, ClassAlertSettingsUpdate
 
 # Retrieves all class objects associated with a specific baby profile and camera type,
 # then converts them to response schema format.
@@ -10,3 +10,9 @@ def fetch_classes_by_profile_and_camera(
 ) -> List[ClassResponse]:
     classes = get_classes_by_profile_and_camera(db, user_id, baby_profile_id, camera_type)
     return [ClassResponse.from_orm(cls) for cls in classes]
+
+# Updates a class's alert settings and returns it in response schema format.
+def edit_class_alert_settings(
+    db: Session, user_id: int, class_id: int, update: ClassAlertSettingsUpdate
+) -> ClassResponse:
+    return ClassResponse.from_orm(update_class_alert_settings(db, user_id, class_id, update))
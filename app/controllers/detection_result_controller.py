@@ -15,6 +15,14 @@ def get_all_detection_results_by_user_controller(db: Session, user_id: int):
 def get_detection_results_by_filters_controller(db: Session, user_id: int, baby_profile_id: int, camera_type: str):
     return detection_result_service.get_detection_results_by_filters(db, user_id, baby_profile_id, camera_type)
 
+# Retrieves one page of a user's detection history with optional filters
+def get_detection_results_page_controller(db: Session, user_id: int, **filters):
+    return detection_result_service.get_detection_results_page(db, user_id, **filters)
+
+# Retrieves a user's detection counts per time bucket with optional filters
+def get_detection_statistics_controller(db: Session, user_id: int, **filters):
+    return detection_result_service.get_detection_statistics(db, user_id, **filters)
+
 # Retrieves a specific detection result for a user by its ID (secured)
 def get_detection_result_by_user_controller(db: Session, detection_id: int, user_id: int):
     result = detection_result_service.get_detection_result_by_user(db, detection_id, user_id)
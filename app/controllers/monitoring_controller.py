@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import Request, Depends
-from app.services.monitoring_service import start_monitoring_service, stop_monitoring_service
+from app.services.monitoring_service import start_monitoring_service, stop_monitoring_service, get_monitoring_stats_service, get_runtime_stats_service
 from app.schemas.monitoring_schemas import StartMonitoringRequest
 from app.services.auth_service import get_current_user
 from app.models.user_model import User
@@ -12,4 +12,12 @@ async def start_monitoring_controller(request: StartMonitoringRequest, current_u
 
 # Stops the monitoring service for the specified list of camera profiles.
 async def stop_monitoring_controller(request: StartMonitoringRequest, db: Session):
-    return await stop_monitoring_service(request.camera_profiles, db)
\ No newline at end of file
+    return await stop_monitoring_service(request.camera_profiles, db)
+
+# Returns detection runtime stats for the current user's cameras.
+def get_monitoring_stats_controller(current_user: User, db: Session):
+    return get_monitoring_stats_service(current_user, db)
+
+# Returns server-wide runtime stats, for operators holding the monitoring token.
+def get_runtime_stats_controller(monitoring_token: str):
+    return get_runtime_stats_service(monitoring_token)
@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
 from app.schemas.streams_schemas import StreamRequest, StreamResponseItem
-from app.services.streams_service import get_streams
+from app.services.streams_service import get_streams, get_relay_stream_url
 from app.models.baby_profile_model import BabyProfile
 from fastapi import HTTPException
 
 async def get_streams_controller(request: StreamRequest, db: Session, current_user):
     return get_streams(db, request.streams)
+
+async def get_relay_stream_url_controller(db: Session, baby_profile_id: int, camera_type: str, current_user):
+    return get_relay_stream_url(db, baby_profile_id, camera_type, current_user.id)
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 from app.models.class_model import ClassObject
 from app.models.detection_result_model import DetectionResult
+from app.models.detection_stats_model import DetectionStatsHourly
 from app.schemas.model_update_schema import ClassItem
+from app.utils.class_cache import class_cache
 
 # Inserts new class entries for a given baby profile and camera type.
 # Each new class is assigned a model_index based on current class count.
@@ -18,6 +20,7 @@ def insert_new_classes(db: Session, baby_profile_id: int, new_classes: list[Clas
         )
         db.add(new_class)
     db.commit()
+    class_cache.invalidate(baby_profile_id, model_type)
 
 # Deletes the specified class names for a given baby profile and camera type.
 # Also removes all detection results associated with those classes and reorders remaining model_index values.
@@ -33,6 +36,10 @@ def delete_db_classes(db: Session, baby_profile_id: int, deleted_classes: list[s
         DetectionResult.class_id.in_(class_ids_to_delete)
     ).delete(synchronize_session=False)
 
+    db.query(DetectionStatsHourly).filter(
+        DetectionStatsHourly.class_id.in_(class_ids_to_delete)
+    ).delete(synchronize_session=False)
+
     # Step 2: Delete the class entries themselves
     db.query(ClassObject).filter(
         ClassObject.baby_profile_id == baby_profile_id,
@@ -51,6 +58,7 @@ def delete_db_classes(db: Session, baby_profile_id: int, deleted_classes: list[s
         cls.model_index = idx  # Reindex remaining classes sequentially
 
     db.commit()
+    class_cache.invalidate(baby_profile_id, model_type)
 
 # Updates risk_level for existing classes that match by name, profile, and camera type.
 def update_db_classes(db: Session, baby_profile_id: int, updated_classes: list[ClassItem], model_type: str):
@@ -63,3 +71,4 @@ def update_db_classes(db: Session, baby_profile_id: int, updated_classes: list[C
         if db_class:
             db_class.risk_level = item.risk_level
     db.commit()
+    class_cache.invalidate(baby_profile_id, model_type)
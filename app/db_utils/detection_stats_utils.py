@@ -0,0 +1,115 @@
+from sqlalchemy import bindparam, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.detection_result_model import DetectionResult
+from app.models.detection_stats_model import DetectionStatsHourly
+
+
+# Start of the hour a detection falls into
+def hour_bucket(timestamp):
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+# Sums detections per bucket key; rows are dicts (or objects) with the DetectionResult fields
+def _bucket_totals(rows):
+    totals = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            row = {name: getattr(row, name) for name in ("baby_profile_id", "camera_type", "class_id", "timestamp", "confidence")}
+        key = (row["baby_profile_id"], row["camera_type"], row["class_id"], hour_bucket(row["timestamp"]))
+        count, confidence_sum = totals.get(key, (0, 0.0))
+        totals[key] = (count + 1, confidence_sum + row["confidence"])
+    # Sorted so concurrent transactions lock buckets in the same order
+    return sorted(totals.items())
+
+
+# Adds newly inserted detections to their hourly buckets (call in the same transaction as the insert)
+def add_to_detection_stats(db: Session, rows):
+    totals = _bucket_totals(rows)
+    if not totals:
+        return
+    stmt = insert(DetectionStatsHourly).values([
+        {
+            "baby_profile_id": profile_id,
+            "camera_type": camera_type,
+            "class_id": class_id,
+            "bucket_start": bucket_start,
+            "count": count,
+            "confidence_sum": confidence_sum
+        }
+        for (profile_id, camera_type, class_id, bucket_start), (count, confidence_sum) in totals
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["baby_profile_id", "camera_type", "class_id", "bucket_start"],
+        set_={
+            "count": DetectionStatsHourly.count + stmt.excluded.count,
+            "confidence_sum": DetectionStatsHourly.confidence_sum + stmt.excluded.confidence_sum
+        }
+    ))
+
+
+# Removes deleted detections from their hourly buckets (call in the same transaction as the delete)
+def remove_from_detection_stats(db: Session, rows):
+    totals = _bucket_totals(rows)
+    if not totals:
+        return
+    table = DetectionStatsHourly.__table__
+    bucket = (
+        (table.c.baby_profile_id == bindparam("b_profile_id"))
+        & (table.c.camera_type == bindparam("b_camera_type"))
+        & (table.c.class_id == bindparam("b_class_id"))
+        & (table.c.bucket_start == bindparam("b_bucket_start"))
+    )
+    params = [
+        {
+            "b_profile_id": profile_id,
+            "b_camera_type": camera_type,
+            "b_class_id": class_id,
+            "b_bucket_start": bucket_start,
+            "b_count": count,
+            "b_confidence_sum": confidence_sum
+        }
+        for (profile_id, camera_type, class_id, bucket_start), (count, confidence_sum) in totals
+    ]
+    # Core executemany on the session's connection: the ORM would treat a list of parameters as an update by primary key
+    connection = db.connection()
+    connection.execute(
+        update(table).where(bucket).values(
+            count=table.c.count - bindparam("b_count"),
+            confidence_sum=table.c.confidence_sum - bindparam("b_confidence_sum")
+        ),
+        params
+    )
+    connection.execute(delete(table).where(bucket & (table.c.count <= 0)), params)
+
+
+# Recomputes the hourly buckets from detection_results (all profiles, or only the given one).
+# The table lock makes concurrent writers wait, so no detection is counted twice or missed.
+def rebuild_detection_stats(db: Session, baby_profile_id: int = None) -> int:
+    db.execute(text("LOCK TABLE detection_stats_hourly IN EXCLUSIVE MODE"))
+
+    clear = delete(DetectionStatsHourly)
+    buckets = select(
+        DetectionResult.baby_profile_id,
+        DetectionResult.camera_type,
+        DetectionResult.class_id,
+        func.date_trunc("hour", DetectionResult.timestamp).label("bucket_start"),
+        func.count().label("count"),
+        func.sum(DetectionResult.confidence).label("confidence_sum")
+    ).where(DetectionResult.timestamp.isnot(None))
+    if baby_profile_id is not None:
+        clear = clear.where(DetectionStatsHourly.baby_profile_id == baby_profile_id)
+        buckets = buckets.where(DetectionResult.baby_profile_id == baby_profile_id)
+    buckets = buckets.group_by(
+        DetectionResult.baby_profile_id,
+        DetectionResult.camera_type,
+        DetectionResult.class_id,
+        func.date_trunc("hour", DetectionResult.timestamp)
+    )
+
+    db.execute(clear.execution_options(synchronize_session=False))
+    result = db.execute(insert(DetectionStatsHourly).from_select(
+        ["baby_profile_id", "camera_type", "class_id", "bucket_start", "count", "confidence_sum"], buckets
+    ))
+    db.commit()
+    return result.rowcount
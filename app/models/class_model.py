@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 import enum
@@ -25,6 +25,8 @@ class ClassObject(Base):
     model_index = Column(Integer, nullable=True)  # Index used in the model's output layer
     camera_type = Column(String, nullable=False)  # 'head_camera' or 'static_camera'
     baby_profile_id = Column(Integer, ForeignKey("baby_profiles.id"), nullable=False)  # Link to associated baby profile
+    confidence_threshold = Column(Float, nullable=True)  # Min confidence to raise an alert (None = system default)
+    cooldown_seconds = Column(Float, nullable=True)  # Min seconds between alerts for this class (None = system default)
 
     # Relationship back to BabyProfile (many-to-one)
     baby_profile = relationship("BabyProfile", back_populates="classes")
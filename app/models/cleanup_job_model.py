@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, DateTime, String
+from datetime import datetime
+from app.models.base import Base
+
+# SQLAlchemy model representing a pending cleanup task (files or Drive folders left behind by a delete)
+class CleanupJob(Base):
+    __tablename__ = "cleanup_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)  # Unique job ID
+    kind = Column(String, nullable=False)  # 'local_dir' (remove a folder under uploads) or 'drive_profile_folder'
+    target = Column(String, nullable=False)  # Folder path, or baby profile ID for Drive folders
+
+    attempts = Column(Integer, nullable=False, default=0)  # Failed attempts so far
+    last_error = Column(String, nullable=True)  # Error message of the last failed attempt
+    created_at = Column(DateTime, default=datetime.now)  # When the job was queued
+    run_after = Column(DateTime, default=datetime.now, index=True)  # Earliest time of the next attempt
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Float, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Float, String, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import pytz
@@ -8,6 +8,12 @@ from app.models.base import Base
 class DetectionResult(Base):
     __tablename__ = "detection_results"
 
+    # Composite indexes for the keyset-paginated history (newest first, id breaks timestamp ties)
+    __table_args__ = (
+        Index("ix_detection_results_profile_camera_ts", "baby_profile_id", "camera_type", "timestamp", "id"),
+        Index("ix_detection_results_profile_ts", "baby_profile_id", "timestamp", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)  # Unique identifier for the detection result
 
     baby_profile_id = Column(Integer, ForeignKey("baby_profiles.id"), nullable=False)  # Link to the related baby profile
@@ -19,6 +25,7 @@ class DetectionResult(Base):
 
     timestamp = Column(DateTime, default=datetime.now)  # When the detection occurred
     image_path = Column(String, nullable=True)  # Path to the image where the detection occurred
+    duration_seconds = Column(Float, nullable=True)  # How long the object stayed in view (None while still in view)
 
     # Relationships to other tables
     baby_profile = relationship("BabyProfile", back_populates="detection_results")  # Link back to baby profile
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Float, String, UniqueConstraint
+from app.models.base import Base
+
+# SQLAlchemy model holding detection counts per hour, maintained as detections are written
+class DetectionStatsHourly(Base):
+    __tablename__ = "detection_stats_hourly"
+
+    # One bucket per profile, camera, class and hour (the key used by the upsert)
+    __table_args__ = (
+        UniqueConstraint("baby_profile_id", "camera_type", "class_id", "bucket_start", name="uq_detection_stats_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)  # Unique identifier for the bucket
+
+    baby_profile_id = Column(Integer, ForeignKey("baby_profiles.id"), nullable=False)  # Link to the related baby profile
+    camera_type = Column(String, nullable=False)  # Type of camera: 'head_camera' or 'static_camera'
+    class_id = Column(Integer, ForeignKey("classes.id"), nullable=False)  # Detected class (risk level is read from it)
+    bucket_start = Column(DateTime, nullable=False)  # Start of the hour covered by this bucket
+
+    count = Column(Integer, nullable=False, default=0)  # Number of detections in the bucket
+    confidence_sum = Column(Float, nullable=False, default=0.0)  # Sum of their confidences (for averages)
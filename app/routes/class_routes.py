@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from typing import List
-from app.controllers.class_controller import fetch_classes_by_profile_and_camera
-from app.schemas.class_schema import ClassResponse
+from app.controllers.class_controller import fetch_classes_by_profile_and_camera, edit_class_alert_settings
+from app.schemas.class_schema import ClassResponse, ClassAlertSettingsUpdate
 from database.database import get_db
 from app.services.auth_service import get_current_user
 
@@ -27,3 +27,14 @@ def get_classes(
         baby_profile_id, 
         camera_type
     )
+
+# Update the alert confidence threshold and/or cooldown of a class
+# Only allows access if the class belongs to one of the current user's profiles
+@router.patch("/{class_id}", response_model=ClassResponse)
+def update_class_alert_settings(
+    class_id: int,
+    update: ClassAlertSettingsUpdate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    return edit_class_alert_settings(db, current_user.id, class_id, update)
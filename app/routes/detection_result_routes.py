@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.schemas import detection_result_schema
 from app.controllers import detection_result_controller
 from database.database import get_db
 from app.services.auth_service import get_current_user
 from app.models.user_model import User
+from app.schemas.class_schema import RiskLevelEnum
 from fastapi.responses import FileResponse
+from datetime import datetime
+from typing import Literal, Optional
+from app.utils.detection_images import get_detection_image_rendition
 import os
 
 router = APIRouter(prefix="/detection_results", tags=["Detection Results"])
@@ -36,6 +40,55 @@ def get_filtered_detection_results(
     )
 
 
+# Retrieve the user's detection history one page at a time (newest first)
+# Pass the returned next_cursor as `cursor` to get the following page
+@router.get("/history", response_model=detection_result_schema.DetectionResultPage)
+def get_detection_history(
+    baby_profile_id: Optional[int] = None,
+    camera_type: Optional[str] = None,
+    risk_level: Optional[RiskLevelEnum] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return detection_result_controller.get_detection_results_page_controller(
+        db, current_user.id,
+        baby_profile_id=baby_profile_id,
+        camera_type=camera_type,
+        risk_level=risk_level.value if risk_level else None,
+        start=start,
+        end=end,
+        cursor=cursor,
+        limit=limit
+    )
+
+
+# Retrieve detection counts per hour (or day), profile, camera and class for dashboards
+@router.get("/stats", response_model=detection_result_schema.DetectionStatsOut)
+def get_detection_statistics(
+    baby_profile_id: Optional[int] = None,
+    camera_type: Optional[str] = None,
+    risk_level: Optional[RiskLevelEnum] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    interval: Literal["hour", "day"] = "hour",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return detection_result_controller.get_detection_statistics_controller(
+        db, current_user.id,
+        baby_profile_id=baby_profile_id,
+        camera_type=camera_type,
+        risk_level=risk_level.value if risk_level else None,
+        start=start,
+        end=end,
+        interval=interval
+    )
+
+
 # Delete multiple detection results grouped by baby profile
 @router.delete("/batch_delete")
 def batch_delete_detection_results(
@@ -60,10 +113,11 @@ def delete_detection_result(detection_id: int, current_user: User = Depends(get_
     return detection_result_controller.delete_detection_result_by_user_controller(db, detection_id, current_user.id)
 
 
-# Get the image associated with a detection result
+# Get the image associated with a detection result (size=medium or thumb for smaller copies, e.g. list tiles)
 @router.get("/{detection_id}/image")
 def get_detection_image(
     detection_id: int,
+    size: Literal["full", "medium", "thumb"] = "full",
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -73,9 +127,10 @@ def get_detection_image(
     if not detection or not detection.image_path:
         raise HTTPException(status_code=404, detail="Image not found")
 
-    # Build full path to image
-    file_path = os.path.join("uploads", detection.image_path)
-    if not os.path.exists(file_path):
+    # Build full path to the requested size (thumb/medium renditions are created on first request if missing)
+    file_path = get_detection_image_rendition(os.path.join("uploads", detection.image_path), size)
+    if file_path is None:
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(file_path)
+    # Detection images never change once written, so clients can keep them
+    return FileResponse(file_path, media_type="image/jpeg", headers={"Cache-Control": "private, max-age=604800, immutable"})
@@ -1,8 +1,8 @@
 # routes/monitoring_routes.py
 
-from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException, Header
 from sqlalchemy.orm import Session
-from app.controllers.monitoring_controller import start_monitoring_controller, stop_monitoring_controller
+from app.controllers.monitoring_controller import start_monitoring_controller, stop_monitoring_controller, get_monitoring_stats_controller, get_runtime_stats_controller
 from app.schemas.monitoring_schemas import StartMonitoringRequest
 from database.database import get_db
 from app.services.auth_service import get_current_user
@@ -43,3 +43,20 @@ async def stop_monitoring(
             raise HTTPException(status_code=403, detail=f"Unauthorized access to baby_profile_id {item.baby_profile_id}")
 
     return await stop_monitoring_controller(request, db)
+
+
+# Get detection runtime stats (effective FPS per camera, relay viewers).
+# Only cameras of baby profiles owned by the authenticated user are listed.
+@router.get("/monitoring/stats")
+def get_monitoring_stats(
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return get_monitoring_stats_controller(current_user, db)
+
+
+# Get server-wide runtime stats (inference pool, cached models, alert queues, writer, DB pools).
+# Operators only: requires the X-Monitoring-Token header to match MONITORING_TOKEN (404 when it isn't configured).
+@router.get("/monitoring/runtime")
+def get_runtime_stats(x_monitoring_token: str = Header(None)):
+    return get_runtime_stats_controller(x_monitoring_token)
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from fastapi.websockets import WebSocketState
 from sqlalchemy.orm import Session
-from app.controllers.streams_controller import get_streams_controller
+from app.controllers.streams_controller import get_streams_controller, get_relay_stream_url_controller
 from app.schemas.streams_schemas import StreamRequest, StreamResponseItem
-from database.database import get_db
+from database.database import get_db, SessionLocal
 from typing import List
-from app.services.auth_service import get_current_user  # ייבוא האימות הקיים שלך
+from app.services.auth_service import get_current_user, verify_jwt_token  # ייבוא האימות הקיים שלך
 from app.models.baby_profile_model import BabyProfile
+from app.models.user_model import User
+from app.utils.stream_relay import MJPEG_BOUNDARY, PREVIEW_VARIANTS, mjpeg_response_body, iter_viewer_frames
+import json
 
 router = APIRouter()
 
@@ -20,4 +26,93 @@ async def get_streams(
         baby_profile = db.query(BabyProfile).filter_by(id=item.baby_profile_id, user_id=current_user.id).first()
         if not baby_profile:
             raise HTTPException(status_code=403, detail=f"Unauthorized access to baby_profile_id {item.baby_profile_id}")
-    return await get_streams_controller(request, db, current_user)
\ No newline at end of file
+    return await get_streams_controller(request, db, current_user)
+
+
+# List the preview variants accepted by the relay endpoints
+@router.get("/preview_variants")
+async def get_preview_variants(current_user=Depends(get_current_user)):
+    return {
+        name: variant._asdict() if variant else None
+        for name, variant in PREVIEW_VARIANTS.items()
+    }
+
+
+# Live MJPEG relayed from the shared camera connection.
+# Needs the usual Bearer header, so a plain <img> tag can't load it; fetch it with an authenticated HTTP client (or use the WebSocket below)
+@router.get("/relay/{baby_profile_id}/{camera_type}")
+async def relay_stream(
+    baby_profile_id: int,
+    camera_type: str,
+    variant: str = Query("full", description="Preview variant, see /preview_variants"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if variant not in PREVIEW_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"Unknown preview variant: {variant}")
+    stream_url = await get_relay_stream_url_controller(db, baby_profile_id, camera_type, current_user)
+    return StreamingResponse(
+        mjpeg_response_body(f"{baby_profile_id}_{camera_type}", stream_url, variant),
+        media_type=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+    )
+
+
+# Live frames over WebSocket: the client sends {"token": ...} first, then receives one binary JPEG per message
+@router.websocket("/ws/{baby_profile_id}/{camera_type}")
+async def relay_stream_websocket(websocket: WebSocket, baby_profile_id: int, camera_type: str, variant: str = "full"):
+    await websocket.accept()
+    try:
+        if variant not in PREVIEW_VARIANTS:
+            await websocket.close(code=4004, reason=f"Unknown preview variant: {variant}")
+            return
+
+        data = json.loads(await websocket.receive_text())
+        token = data.get("token")
+        if not token:
+            await websocket.close(code=4001)
+            return
+
+        payload = verify_jwt_token(token)
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.username == payload.get("sub")).first()
+            if not user:
+                await websocket.close(code=4002)
+                return
+            stream_url = await get_relay_stream_url_controller(db, baby_profile_id, camera_type, user)
+        finally:
+            db.close()
+
+        async def send_frames():
+            async for jpeg in iter_viewer_frames(f"{baby_profile_id}_{camera_type}", stream_url, variant):
+                await websocket.send_bytes(jpeg)
+
+        # While the camera is offline nothing is sent, so a failed send can't reveal a gone viewer; read for the disconnect instead
+        async def wait_for_disconnect():
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        tasks = [asyncio.create_task(send_frames()), asyncio.create_task(wait_for_disconnect())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Stopping the sender ends the viewer and releases its hold on the camera stream
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task in done:
+            task.result()  # Re-raise a sender error
+
+    except WebSocketDisconnect:
+        pass
+    except HTTPException as e:
+        await _close_if_open(websocket, 4003, e.detail)
+    except Exception as e:
+        print(f"[ERROR] Relay WebSocket error: {e}")
+        await _close_if_open(websocket, 1011)
+
+
+# Close a WebSocket unless either side already closed it (closing twice raises)
+async def _close_if_open(websocket: WebSocket, code: int, reason: str = None):
+    if websocket.client_state == WebSocketState.CONNECTED and websocket.application_state == WebSocketState.CONNECTED:
+        await websocket.close(code=code, reason=reason)
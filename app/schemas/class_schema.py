@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from enum import Enum
 
@@ -16,6 +16,13 @@ class ClassResponse(BaseModel):
     model_index: Optional[int]  # Index in the model's output layer (used internally)
     camera_type: str  # Type of camera: 'head_camera' or 'static_camera'
     baby_profile_id: int  # ID of the baby profile this class belongs to
+    confidence_threshold: Optional[float] = None  # Min confidence to raise an alert (None = system default)
+    cooldown_seconds: Optional[float] = None  # Min seconds between alerts for this class (None = system default)
 
     class Config:
         from_attributes = True  # Allows reading from ORM objects like SQLAlchemy models
+
+# Request schema for changing a class's alert settings (send null to go back to the system default)
+class ClassAlertSettingsUpdate(BaseModel):
+    confidence_threshold: Optional[float] = Field(None, ge=0.0, le=1.0)
+    cooldown_seconds: Optional[float] = Field(None, ge=0.0)
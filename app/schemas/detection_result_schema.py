@@ -47,6 +47,36 @@ class DetectionResultOut(BaseModel):
     timestamp: datetime  # When the detection occurred
     risk_level: Optional[str]  # Risk level of the class (e.g., "high")
     image_path: Optional[str]  # Path to image saved for this detection
+    duration_seconds: Optional[float] = None  # How long the object stayed in view
 
     class Config:
         from_attributes = True  # Enable loading data from ORM objects (e.g., SQLAlchemy)
+
+
+class DetectionResultPage(BaseModel):
+    """One page of detection history, newest first."""
+
+    items: List[DetectionResultOut]  # Detections on this page
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next page (None on the last page)
+    has_more: bool  # Whether older detections exist after this page
+
+
+class DetectionStatsBucket(BaseModel):
+    """Detection count for one profile, camera and class over one time bucket."""
+
+    bucket_start: datetime  # Start of the hour (or day) covered by the bucket
+    baby_profile_id: int  # ID of the baby profile
+    camera_type: str  # Camera source: "head_camera" or "static_camera"
+    class_id: int  # ID of the detected object class
+    class_name: str  # Name of the detected object class
+    risk_level: Optional[str]  # Current risk level of the class
+    count: int  # Number of detections in the bucket
+    avg_confidence: float  # Average confidence of those detections
+
+
+class DetectionStatsOut(BaseModel):
+    """Detection counts over time, read from the hourly rollup table."""
+
+    interval: str  # Bucket size: "hour" or "day"
+    total: int  # Number of detections across all returned buckets
+    buckets: List[DetectionStatsBucket]  # Buckets ordered by time, then profile, camera and class
@@ -12,3 +12,4 @@ class StreamResponseItem(BaseModel):
     baby_profile_id: int
     model_type: str
     stream_url: str
+    relay_url: str  # Server relay, shares one camera connection between all viewers
@@ -1,12 +1,12 @@
-import os
-import shutil
 from sqlalchemy.orm import Session
 
 from app.models.baby_profile_model import BabyProfile
 from app.models.class_model import ClassObject
 from app.models.detection_result_model import DetectionResult
+from app.models.detection_stats_model import DetectionStatsHourly
 from app.schemas import baby_profile_schema
-from app.utils.google_drive_service import GoogleDriveService
+from app.utils.class_cache import class_cache
+from app.services.cleanup_job_service import enqueue_profile_cleanup
 
 
 # Create a new baby profile in the database
@@ -51,38 +51,29 @@ def update_baby_profile_by_user(db: Session, profile_id: int, user_id: int, prof
     return db_profile
 
 
-# Delete a baby profile and clean up all related resources (DB and file system)
+# Bulk-delete the given baby profiles and everything stored for them (no commit).
+# Files and Drive folders are queued as cleanup jobs in the same transaction.
+def delete_baby_profiles_data(db: Session, profile_ids: list[int]):
+    if not profile_ids:
+        return
+    db.query(DetectionStatsHourly).filter(DetectionStatsHourly.baby_profile_id.in_(profile_ids)).delete(synchronize_session=False)
+    db.query(DetectionResult).filter(DetectionResult.baby_profile_id.in_(profile_ids)).delete(synchronize_session=False)
+    db.query(ClassObject).filter(ClassObject.baby_profile_id.in_(profile_ids)).delete(synchronize_session=False)
+    db.query(BabyProfile).filter(BabyProfile.id.in_(profile_ids)).delete(synchronize_session=False)
+    for profile_id in profile_ids:
+        enqueue_profile_cleanup(db, profile_id)
+
+
+# Delete a baby profile and clean up all related resources (DB now, file system and Drive in the background)
 def delete_baby_profile_by_user(db: Session, profile_id: int, user_id: int):
     db_profile = get_baby_profile_by_user(db, profile_id, user_id)
     if db_profile is None:
         return None
 
-    # Delete the baby profile itself
-    db.delete(db_profile)
-
-    # Delete all associated classes
-    db_classes = db.query(ClassObject).filter(ClassObject.baby_profile_id == profile_id).all()
-    for item in db_classes:
-        db.delete(item)
-
-    # Delete all associated detection results
-    db_detection_results = db.query(DetectionResult).filter(DetectionResult.baby_profile_id == profile_id).all()
-    for item in db_detection_results:
-        db.delete(item)
-
+    # Keep the loaded profile for the response; the row itself is removed by the bulk delete
+    db.expunge(db_profile)
+    delete_baby_profiles_data(db, [profile_id])
     db.commit()
-
-    # Remove associated local folders for detections and training data
-    detections_path = os.path.join("uploads", "detections", str(profile_id))
-    if os.path.exists(detections_path):
-        shutil.rmtree(detections_path)
-
-    training_data_path = os.path.join("uploads", "training_data", str(profile_id))
-    if os.path.exists(training_data_path):
-        shutil.rmtree(training_data_path)
-
-    # Remove corresponding Google Drive folder (if exists)
-    drive_service = GoogleDriveService()
-    drive_service.delete_baby_profile_folder(profile_id)
+    class_cache.invalidate(profile_id)
 
     return db_profile
@@ -3,7 +3,8 @@ from typing import List
 from fastapi import HTTPException
 from app.models.class_model import ClassObject
 from app.models.baby_profile_model import BabyProfile
-from app.schemas.class_schema import ClassResponse
+from app.schemas.class_schema import ClassResponse, ClassAlertSettingsUpdate
+from app.utils.class_cache import class_cache
 
 # Retrieve all object classes associated with a given baby profile and camera type.
 # First verifies that the baby profile belongs to the authenticated user.
@@ -21,3 +22,23 @@ def get_classes_by_profile_and_camera(
         baby_profile_id=baby_profile_id,
         camera_type=camera_type
     ).all()
+
+# Update the alert settings (confidence threshold, cooldown) of a class owned by the user.
+# Running detection loops pick up the change through the class cache.
+def update_class_alert_settings(
+    db: Session, user_id: int, class_id: int, update: ClassAlertSettingsUpdate
+) -> ClassObject:
+    class_obj = db.query(ClassObject).join(BabyProfile, ClassObject.baby_profile_id == BabyProfile.id).filter(
+        ClassObject.id == class_id,
+        BabyProfile.user_id == user_id
+    ).first()
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+
+    for field, value in update.dict(exclude_unset=True).items():
+        setattr(class_obj, field, value)
+    db.commit()
+    db.refresh(class_obj)
+
+    class_cache.invalidate(class_obj.baby_profile_id, class_obj.camera_type)
+    return class_obj
@@ -0,0 +1,73 @@
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+from app.models.cleanup_job_model import CleanupJob
+from app.utils.config import config
+from app.utils.google_drive_service import GoogleDriveService
+from database.database import SessionLocal
+
+# Queue a cleanup job; it's stored with the caller's transaction, so it exists only if the delete commits
+def enqueue_cleanup(db: Session, kind: str, target: str):
+    db.add(CleanupJob(kind=kind, target=target))
+
+# Queue removal of everything a deleted baby profile left outside the database
+def enqueue_profile_cleanup(db: Session, profile_id: int):
+    enqueue_cleanup(db, "local_dir", os.path.join("uploads", "detections", str(profile_id)))
+    enqueue_cleanup(db, "local_dir", os.path.join("uploads", "training_data", str(profile_id)))
+    enqueue_cleanup(db, "drive_profile_folder", str(profile_id))
+
+# Perform a single job; raises on failure so it's retried later
+def run_job(job: CleanupJob):
+    if job.kind == "local_dir":
+        if os.path.exists(job.target):
+            shutil.rmtree(job.target)
+    elif job.kind == "drive_profile_folder":
+        # The queue already retries with backoff, so keep Drive's own retries short
+        GoogleDriveService().delete_baby_profile_folder(int(job.target), max_retries=2, raise_on_failure=True)
+    else:
+        raise ValueError(f"Unknown cleanup job kind: {job.kind}")
+
+# Claim and run one due job; returns False when none is due.
+# SKIP LOCKED lets several server processes share the queue without running a job twice.
+def run_next_job(db: Session) -> bool:
+    job = db.query(CleanupJob).filter(
+        CleanupJob.run_after <= datetime.now(),
+        CleanupJob.attempts < config.CLEANUP_MAX_ATTEMPTS
+    ).order_by(CleanupJob.id).with_for_update(skip_locked=True).first()
+    if job is None:
+        db.rollback()
+        return False
+
+    try:
+        run_job(job)
+        db.delete(job)
+        print(f"[CLEANUP] Done: {job.kind} {job.target}")
+    except Exception as e:
+        job.attempts += 1
+        job.last_error = str(e)[:500]
+        job.run_after = datetime.now() + timedelta(seconds=config.CLEANUP_POLL_SECONDS * 2 ** job.attempts)
+        print(f"[CLEANUP] Attempt {job.attempts} failed for {job.kind} {job.target}: {e}")
+    db.commit()
+    return True
+
+# Infinite loop running due cleanup jobs
+def cleanup_loop():
+    while True:
+        db = SessionLocal()
+        try:
+            while run_next_job(db):
+                pass
+        except Exception as e:
+            print(f"[ERROR] Cleanup polling error: {e}")
+        finally:
+            db.close()
+        time.sleep(config.CLEANUP_POLL_SECONDS)
+
+# Starts the background cleanup thread on app startup
+def start_cleanup_thread():
+    thread = threading.Thread(target=cleanup_loop, daemon=True)
+    thread.start()
@@ -1,7 +1,14 @@
+import base64
+from datetime import datetime
+from sqlalchemy import delete, func, select, tuple_, union_all
 from sqlalchemy.orm import Session, joinedload
 from app.models.detection_result_model import DetectionResult
 from app.models.baby_profile_model import BabyProfile
 from app.models.class_model import ClassObject
+from app.models.detection_stats_model import DetectionStatsHourly
+from app.db_utils.detection_stats_utils import add_to_detection_stats, hour_bucket, remove_from_detection_stats
+from app.utils.file_reaper import file_reaper
+from app.utils.detection_images import detection_image_files
 from app.schemas import detection_result_schema
 import os
 from fastapi import HTTPException
@@ -11,6 +18,8 @@ from fastapi import HTTPException
 def create_detection_result(db: Session, data: detection_result_schema.DetectionResultCreate):
     db_result = DetectionResult(**data.dict())
     db.add(db_result)
+    db.flush()
+    add_to_detection_stats(db, [db_result])
     db.commit()
     db.refresh(db_result)
     return db_result
@@ -37,7 +46,8 @@ def get_all_detection_results_by_user(db: Session, user_id: int):
             camera_type=result.camera_type,
             timestamp=result.timestamp,
             risk_level=result.class_.risk_level,
-            image_path=result.image_path
+            image_path=result.image_path,
+            duration_seconds=result.duration_seconds
         )
         for result in results
     ]
@@ -65,12 +75,171 @@ def get_detection_results_by_filters(db: Session, user_id: int, baby_profile_id:
             camera_type=result.camera_type,
             timestamp=result.timestamp,
             risk_level=result.class_.risk_level,
-            image_path=result.image_path
+            image_path=result.image_path,
+            duration_seconds=result.duration_seconds
         )
         for result in results
     ]
 
 
+# Encode the (timestamp, id) of the last row on a page as an opaque cursor
+def _encode_cursor(timestamp: datetime, detection_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{detection_id}".encode()).decode()
+
+
+# Decode a cursor produced by _encode_cursor
+def _decode_cursor(cursor: str):
+    try:
+        timestamp, detection_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(detection_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Get one page of the user's detection history, newest first, using keyset pagination on (timestamp, id).
+# Each of the user's profiles is read in its own index-ordered branch capped at the page size, and only
+# the merged page is joined for names, so the cost depends on the page size and profile count, not on history length.
+def get_detection_results_page(
+    db: Session,
+    user_id: int,
+    baby_profile_id: int = None,
+    camera_type: str = None,
+    risk_level: str = None,
+    start: datetime = None,
+    end: datetime = None,
+    cursor: str = None,
+    limit: int = 50
+):
+    profiles = db.query(BabyProfile.id).filter(BabyProfile.user_id == user_id)
+    if baby_profile_id is not None:
+        profiles = profiles.filter(BabyProfile.id == baby_profile_id)
+    profile_ids = [profile_id for (profile_id,) in profiles.all()]
+    if not profile_ids:
+        return detection_result_schema.DetectionResultPage(items=[], next_cursor=None, has_more=False)
+
+    cursor_key = _decode_cursor(cursor) if cursor else None
+
+    # Fetch one extra row to know whether another page exists
+    branches = []
+    for profile_id in profile_ids:
+        branch = select(DetectionResult.id, DetectionResult.timestamp).where(DetectionResult.baby_profile_id == profile_id)
+        if camera_type is not None:
+            branch = branch.where(DetectionResult.camera_type == camera_type)
+        if risk_level is not None:
+            branch = branch.join(ClassObject, DetectionResult.class_id == ClassObject.id).where(ClassObject.risk_level == risk_level)
+        if start is not None:
+            branch = branch.where(DetectionResult.timestamp >= start)
+        if end is not None:
+            branch = branch.where(DetectionResult.timestamp < end)
+        if cursor_key is not None:
+            branch = branch.where(tuple_(DetectionResult.timestamp, DetectionResult.id) < tuple_(*cursor_key))
+        branch = branch.order_by(DetectionResult.timestamp.desc(), DetectionResult.id.desc()).limit(limit + 1).subquery()
+        # Selecting from the limited subquery keeps the UNION ALL portable (no LIMIT inside a compound member)
+        branches.append(select(branch.c.id, branch.c.timestamp))
+    candidates = (branches[0] if len(branches) == 1 else union_all(*branches)).subquery()
+
+    rows = db.query(
+        DetectionResult.id,
+        DetectionResult.baby_profile_id,
+        BabyProfile.name.label("baby_profile_name"),
+        DetectionResult.class_id,
+        DetectionResult.class_name,
+        DetectionResult.confidence,
+        DetectionResult.camera_type,
+        DetectionResult.timestamp,
+        ClassObject.risk_level,
+        DetectionResult.image_path,
+        DetectionResult.duration_seconds
+    ).join(candidates, DetectionResult.id == candidates.c.id).join(
+        BabyProfile, DetectionResult.baby_profile_id == BabyProfile.id
+    ).join(
+        ClassObject, DetectionResult.class_id == ClassObject.id
+    ).order_by(candidates.c.timestamp.desc(), candidates.c.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return detection_result_schema.DetectionResultPage(
+        items=[detection_result_schema.DetectionResultOut(**row._asdict()) for row in rows],
+        next_cursor=_encode_cursor(rows[-1].timestamp, rows[-1].id) if has_more else None,
+        has_more=has_more
+    )
+
+
+# Get detection counts per time bucket from the hourly rollup, so the cost depends on the number of buckets, not detections.
+# start/end are applied at hour precision (a bucket is included if it starts in [hour of start, end)).
+def get_detection_statistics(
+    db: Session,
+    user_id: int,
+    baby_profile_id: int = None,
+    camera_type: str = None,
+    risk_level: str = None,
+    start: datetime = None,
+    end: datetime = None,
+    interval: str = "hour"
+):
+    bucket_start = DetectionStatsHourly.bucket_start
+    if interval == "day":
+        bucket_start = func.date_trunc("day", DetectionStatsHourly.bucket_start)
+    bucket_start = bucket_start.label("bucket_start")
+
+    query = db.query(
+        bucket_start,
+        DetectionStatsHourly.baby_profile_id,
+        DetectionStatsHourly.camera_type,
+        DetectionStatsHourly.class_id,
+        ClassObject.name.label("class_name"),
+        ClassObject.risk_level,
+        func.sum(DetectionStatsHourly.count).label("count"),
+        func.sum(DetectionStatsHourly.confidence_sum).label("confidence_sum")
+    ).join(BabyProfile, DetectionStatsHourly.baby_profile_id == BabyProfile.id).join(
+        ClassObject, DetectionStatsHourly.class_id == ClassObject.id
+    ).filter(BabyProfile.user_id == user_id)
+
+    if baby_profile_id is not None:
+        query = query.filter(DetectionStatsHourly.baby_profile_id == baby_profile_id)
+    if camera_type is not None:
+        query = query.filter(DetectionStatsHourly.camera_type == camera_type)
+    if risk_level is not None:
+        query = query.filter(ClassObject.risk_level == risk_level)
+    if start is not None:
+        query = query.filter(DetectionStatsHourly.bucket_start >= hour_bucket(start))
+    if end is not None:
+        query = query.filter(DetectionStatsHourly.bucket_start < end)
+
+    rows = query.group_by(
+        bucket_start,
+        DetectionStatsHourly.baby_profile_id,
+        DetectionStatsHourly.camera_type,
+        DetectionStatsHourly.class_id,
+        ClassObject.name,
+        ClassObject.risk_level
+    ).order_by(
+        bucket_start,
+        DetectionStatsHourly.baby_profile_id,
+        DetectionStatsHourly.camera_type,
+        DetectionStatsHourly.class_id
+    ).all()
+
+    buckets = [
+        detection_result_schema.DetectionStatsBucket(
+            bucket_start=row.bucket_start,
+            baby_profile_id=row.baby_profile_id,
+            camera_type=row.camera_type,
+            class_id=row.class_id,
+            class_name=row.class_name,
+            risk_level=row.risk_level,
+            count=row.count,
+            avg_confidence=row.confidence_sum / row.count
+        )
+        for row in rows
+    ]
+    return detection_result_schema.DetectionStatsOut(
+        interval=interval,
+        total=sum(bucket.count for bucket in buckets),
+        buckets=buckets
+    )
+
+
 # Get a single detection result by ID (only if it belongs to the user)
 def get_detection_result_by_user(db: Session, detection_id: int, user_id: int):
     result = db.query(DetectionResult).join(BabyProfile).join(ClassObject).filter(
@@ -94,7 +263,8 @@ def get_detection_result_by_user(db: Session, detection_id: int, user_id: int):
         camera_type=result.camera_type,
         timestamp=result.timestamp,
         risk_level=result.class_.risk_level,
-        image_path=result.image_path
+        image_path=result.image_path,
+        duration_seconds=result.duration_seconds
     )
 
 
@@ -111,18 +281,14 @@ def delete_detection_result_by_user(db: Session, detection_id: int, user_id: int
     if db_result is None:
         return None
 
-    # Attempt to delete associated image file
-    if db_result.image_path:
-        file_path = os.path.join("uploads", db_result.image_path)
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"Failed to delete image file: {e}")
-
+    remove_from_detection_stats(db, [db_result])
     db.delete(db_result)
     db.commit()
 
+    # Delete the associated image file in the background
+    if db_result.image_path:
+        file_reaper.delete(detection_image_files(os.path.join("uploads", db_result.image_path)))
+
     return detection_result_schema.DetectionResultOut(
         id=db_result.id,
         baby_profile_id=db_result.baby_profile_id,
@@ -133,11 +299,12 @@ def delete_detection_result_by_user(db: Session, detection_id: int, user_id: int
         camera_type=db_result.camera_type,
         timestamp=db_result.timestamp,
         risk_level=db_result.class_.risk_level,
-        image_path=db_result.image_path
+        image_path=db_result.image_path,
+        duration_seconds=db_result.duration_seconds
     )
 
 
-# Delete multiple detection results in batch (grouped by baby profile, secured)
+# Delete multiple detection results in batch (grouped by baby profile, secured) with a single DELETE ... RETURNING
 def batch_delete_detection_results_by_user(db: Session, user_id: int, alerts_by_baby: dict):
     # Convert JSON string keys to integers
     try:
@@ -156,28 +323,31 @@ def batch_delete_detection_results_by_user(db: Session, user_id: int, alerts_by_
     if unauthorized:
         raise HTTPException(status_code=403, detail=f"Unauthorized access to baby profile(s): {list(unauthorized)}")
 
-    # Loop over baby profiles and alert IDs, deleting valid ones
-    deleted_results = []
-
-    for baby_id_str, alert_ids in alerts_by_baby.items():
-        baby_id = int(baby_id_str)
-        for alert_id in alert_ids:
-            detection = db.query(DetectionResult).join(BabyProfile).filter(
-                DetectionResult.id == alert_id,
-                DetectionResult.baby_profile_id == baby_id,
-                BabyProfile.user_id == user_id
-            ).first()
-
-            if detection:
-                if detection.image_path:
-                    file_path = os.path.join("uploads", detection.image_path)
-                    if os.path.exists(file_path):
-                        try:
-                            os.remove(file_path)
-                        except Exception as e:
-                            print(f"Failed to delete image file: {e}")
-                deleted_results.append(detection)
-                db.delete(detection)
+    pairs = [(int(baby_id), alert_id) for baby_id, alert_ids in alerts_by_baby.items() for alert_id in alert_ids]
+    if not pairs:
+        return {"deleted_count": 0}
 
+    # One set-based DELETE scoped by the user's profiles; the returned rows feed the stats rollup and the file reaper
+    deleted = db.execute(
+        delete(DetectionResult).where(
+            DetectionResult.baby_profile_id.in_(select(BabyProfile.id).where(BabyProfile.user_id == user_id)),
+            tuple_(DetectionResult.baby_profile_id, DetectionResult.id).in_(pairs)
+        ).returning(
+            DetectionResult.image_path,
+            DetectionResult.baby_profile_id,
+            DetectionResult.camera_type,
+            DetectionResult.class_id,
+            DetectionResult.timestamp,
+            DetectionResult.confidence
+        ).execution_options(synchronize_session=False)
+    ).all()
+
+    remove_from_detection_stats(db, deleted)
     db.commit()
-    return {"deleted_count": len(deleted_results)}
+
+    # Images (and their renditions) are removed in the background once the rows are gone
+    file_reaper.delete([
+        path for row in deleted if row.image_path
+        for path in detection_image_files(os.path.join("uploads", row.image_path))
+    ])
+    return {"deleted_count": len(deleted)}
@@ -1,10 +1,12 @@
 import os
+import hmac
 from fastapi import HTTPException, Request
 from sqlalchemy.orm import Session
 from app.models.baby_profile_model import BabyProfile
-from app.utils.detection import start_detection_loop, stop_detection_loop
+from app.utils.detection import start_detection_loop, stop_detection_loop, get_detection_stats, get_runtime_stats
 from app.schemas.monitoring_schemas import CameraTuple
 from app.models.user_model import User
+from app.utils.config import config
 from typing import List
 
 # Starts monitoring (object detection) for the provided list of baby profiles and camera types
@@ -30,7 +32,7 @@ async def start_monitoring_service(camera_profiles: List[CameraTuple], current_u
             raise HTTPException(status_code=404, detail=f"Model file not found for {item.camera_type} on profile {item.baby_profile_id}")
 
         # Start detection loop
-        session = await start_detection_loop(profile.id, item.camera_type, ip, user_id, model_path, db, camera_profiles)
+        session = await start_detection_loop(profile.id, item.camera_type, ip, user_id, model_path, camera_profiles)
         active_sessions.append(session)
 
         # Update monitoring flag in DB
@@ -55,3 +57,18 @@ async def stop_monitoring_service(camera_profiles: List[CameraTuple], db: Sessio
             db.commit()
 
     return {"status": "monitoring_stopped"}
+
+
+# Returns runtime stats (effective FPS per camera, relay viewers) for the user's active cameras
+def get_monitoring_stats_service(current_user: User, db: Session):
+    profile_ids = {row.id for row in db.query(BabyProfile.id).filter(BabyProfile.user_id == current_user.id).all()}
+    return get_detection_stats(profile_ids)
+
+
+# Returns server-wide runtime stats (inference pool, models, alert queues, DB pools) for operators
+def get_runtime_stats_service(monitoring_token: str):
+    if not config.MONITORING_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not monitoring_token or not hmac.compare_digest(monitoring_token, config.MONITORING_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid monitoring token")
+    return get_runtime_stats()
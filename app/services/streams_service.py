@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from typing import List
+from fastapi import HTTPException
 from app.models.baby_profile_model import BabyProfile
 from app.schemas.streams_schemas import StreamRequestItem, StreamResponseItem
 
@@ -23,7 +24,24 @@ def get_streams(db: Session, stream_requests: List[StreamRequestItem]) -> List[S
             response.append(StreamResponseItem(
                 baby_profile_id=item.baby_profile_id,
                 model_type=item.model_type,
-                stream_url=stream_url
+                stream_url=stream_url,
+                relay_url=f"/api/streaming/relay/{item.baby_profile_id}/{item.model_type}"
             ))
 
     return response
+
+
+# Resolve the camera stream URL of a profile owned by the user, for the relay endpoints
+def get_relay_stream_url(db: Session, baby_profile_id: int, camera_type: str, user_id: int) -> str:
+    baby_profile = db.query(BabyProfile).filter_by(id=baby_profile_id, user_id=user_id).first()
+    if not baby_profile:
+        raise HTTPException(status_code=403, detail=f"Unauthorized access to baby_profile_id {baby_profile_id}")
+
+    ip = None
+    if camera_type == "head_camera":
+        ip = baby_profile.head_camera_ip
+    elif camera_type == "static_camera":
+        ip = baby_profile.static_camera_ip
+    if not ip:
+        raise HTTPException(status_code=404, detail=f"No {camera_type} configured for baby_profile_id {baby_profile_id}")
+    return f"http://{ip}/stream"
@@ -3,7 +3,8 @@ from app.models.user_model import User
 from app.schemas import user_schema
 from app.utils.hashing import hash_password
 from app.models.baby_profile_model import BabyProfile
-from app.services.baby_profile_service import delete_baby_profile_by_user
+from app.services.baby_profile_service import delete_baby_profiles_data
+from app.utils.class_cache import class_cache
 
 # Create a new user in the database
 def create_user(db: Session, user_data: user_schema.UserCreate):
@@ -48,12 +49,13 @@ def delete_user(db: Session, user_id: int):
     if db_user is None:
         return None
 
-    # First delete all associated baby profiles
-    db_baby_profiles = db.query(BabyProfile).filter(BabyProfile.user_id == user_id).all()
-    for item in db_baby_profiles:
-        delete_baby_profile_by_user(db, item.id, user_id)
+    # First delete all associated baby profiles (in bulk, files are cleaned up in the background)
+    profile_ids = [row.id for row in db.query(BabyProfile.id).filter(BabyProfile.user_id == user_id).all()]
+    delete_baby_profiles_data(db, profile_ids)
 
-    # Then delete the user itself
+    # Then delete the user itself, in the same transaction
     db.delete(db_user)
     db.commit()
+    for profile_id in profile_ids:
+        class_cache.invalidate(profile_id)
     return db_user
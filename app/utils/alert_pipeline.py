@@ -0,0 +1,318 @@
+import asyncio
+import os
+import cv2
+import numpy as np
+from datetime import datetime
+from app.models.user_model import UserFCMToken
+from app.utils.config import config
+from app.utils.detection_images import detection_image_files, detection_image_path, write_detection_image
+from app.utils.detection_writer import detection_writer
+from app.utils.fcm_push import send_push_notifications
+from app.utils.websocket_broadcast import broadcast_detection
+from database.database import DetectionSessionLocal
+
+# Root folder for annotated detection images
+DETECTIONS_BASE_PATH = os.path.join("uploads", "detections")
+
+
+class Alert:
+    """A confirmed detection on its way to disk, the database and the user's devices."""
+
+    def __init__(self, profile_id, camera_type, user_id, model_index, class_obj_id, class_name, risk_level, confidence, xyxy, jpeg, escalated=False):
+        self.profile_id = profile_id
+        self.camera_type = camera_type
+        self.user_id = user_id
+        self.model_index = model_index  # Class index in the model output
+        self.class_obj_id = class_obj_id  # ClassObject.id
+        self.class_name = class_name
+        self.risk_level = risk_level  # Risk level value ('low', 'medium', 'high' or 'unknown')
+        self.confidence = confidence
+        self.xyxy = xyxy  # Box in full-resolution pixel coordinates
+        self.jpeg = jpeg  # Raw camera JPEG, decoded only by the image worker
+        self.escalated = escalated  # Re-alert for an already reported object whose confidence rose
+        self.created_at = datetime.now()
+        self.file_path, self.image_path = detection_image_path(
+            DETECTIONS_BASE_PATH, profile_id, camera_type, class_name, class_obj_id, confidence
+        )
+        self.detection_id = None  # Set once the DetectionResult row is stored
+        self.duration_seconds = None  # How long the object stayed in view, once it left
+        self.settled = asyncio.Event()  # Set once the alert is stored, dropped or failed
+
+
+# One step of the pipeline: a bounded queue drained by its own worker tasks
+class _Stage:
+    def __init__(self, name, handler, workers, maxsize, policy, next_stages=(), on_abandon=None):
+        self.name = name
+        self.handler = handler  # async handler(alert) -> bool, False stops the alert at this stage
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.next_stages = next_stages
+        self.on_abandon = on_abandon  # Called with alerts dropped from or failed in this stage
+        self.queue = None  # Created on start, bound to the running event loop
+        self.tasks = []
+
+        # Counters exposed for monitoring
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self):
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self.tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    def put(self, alert) -> bool:
+        """Queues an alert without waiting; applies the overflow policy when the stage is full."""
+        if self.queue.full():
+            if self.policy == "drop_newest":
+                self._drop(alert)
+                return False
+            self._drop(self.queue.get_nowait())
+            self.queue.task_done()
+        self.queue.put_nowait(alert)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.queue.qsize() if self.queue else 0,
+            "max_size": self.maxsize,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    def _drop(self, alert):
+        self.dropped += 1
+        print(f"[WARNING] Alert queue '{self.name}' full, dropped alert for profile {alert.profile_id} ({alert.class_name})")
+        if self.on_abandon:
+            self.on_abandon(alert)
+
+    async def _run(self):
+        while True:
+            alert = await self.queue.get()
+            try:
+                if await self.handler(alert):
+                    for stage in self.next_stages:
+                        stage.put(alert)
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                print(f"[ERROR] Alert stage '{self.name}' failed for profile {alert.profile_id}: {e}")
+                if self.on_abandon:
+                    self.on_abandon(alert)
+            finally:
+                self.queue.task_done()
+
+
+class AlertPipeline:
+    """
+    Delivers detection alerts off the detection loop's critical path.
+
+    The detection loop only calls submit(); dedicated workers then write the annotated
+    image, store the DetectionResult row through the batching detection writer (persist
+    workers wait on their row concurrently so a flush can cover many alerts), and fan
+    the stored alert out to the WebSocket and push workers. Every stage has its own bounded queue, so a slow FCM call or a
+    burst of detections never blocks frame analysis. When a stage is full the overflow
+    policy decides whether the oldest queued alert or the incoming one is dropped.
+    """
+
+    def __init__(self, maxsize: int = 100, policy: str = "drop_oldest", image_workers: int = 2, push_workers: int = 2, persist_workers: int = 1):
+        if policy not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Unsupported alert overflow policy: {policy}")
+        self.policy = policy
+        self.submitted = 0
+        self._started = False
+
+        self.websocket_stage = _Stage("websocket", _deliver_websocket, 1, maxsize, policy)
+        self.push_stage = _Stage("push", _deliver_push, push_workers, maxsize, policy)
+        self.persist_stage = _Stage(
+            "persist", _persist_detection, persist_workers, maxsize, policy,
+            next_stages=(self.websocket_stage, self.push_stage), on_abandon=_abandon_stored_image
+        )
+        self.image_stage = _Stage(
+            "image", _write_image, image_workers, maxsize, policy,
+            next_stages=(self.persist_stage,), on_abandon=_abandon
+        )
+        self.duration_stage = _Stage("duration", _store_duration, persist_workers, maxsize, policy)
+        self.stages = [self.image_stage, self.persist_stage, self.websocket_stage, self.push_stage, self.duration_stage]
+
+    def submit(self, alert: Alert) -> bool:
+        """Queues an alert from the event loop; returns False if it was dropped right away."""
+        self._start()
+        self.submitted += 1
+        return self.image_stage.put(alert)
+
+    def record_duration(self, alert: Alert, seconds: float):
+        """Stores how long the alerted object stayed in view, once its row exists."""
+        self._start()
+        alert.duration_seconds = seconds
+        self.duration_stage.put(alert)
+
+    def _start(self):
+        if not self._started:
+            for stage in self.stages:
+                stage.start()
+            self._started = True
+
+    def stats(self) -> dict:
+        return {
+            "overflow_policy": self.policy,
+            "submitted": self.submitted,
+            "stages": {stage.name: stage.stats() for stage in self.stages},
+        }
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Waits (up to timeout) for queued alerts to drain, then stops the workers."""
+        if not self._started:
+            return
+        try:
+            for stage in self.stages:
+                await asyncio.wait_for(stage.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print("[WARNING] Alert pipeline did not drain before shutdown")
+        for stage in self.stages:
+            for task in stage.tasks:
+                task.cancel()
+        self._started = False
+
+
+async def _write_image(alert: Alert) -> bool:
+    def write():
+        frame = cv2.imdecode(np.frombuffer(alert.jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("could not decode camera frame")
+        if not write_detection_image(alert.file_path, alert.class_name, alert.xyxy, alert.confidence, frame):
+            raise IOError(f"could not write {alert.file_path}")
+
+    await asyncio.to_thread(write)
+    alert.jpeg = None  # Free the frame as soon as it's on disk
+    return True
+
+
+async def _persist_detection(alert: Alert) -> bool:
+    alert.detection_id = await detection_writer.insert({
+        "baby_profile_id": alert.profile_id,
+        "class_id": alert.class_obj_id,
+        "class_name": alert.class_name,
+        "confidence": alert.confidence,
+        "camera_type": alert.camera_type,
+        "timestamp": alert.created_at,
+        "image_path": alert.image_path,
+    })
+    alert.settled.set()
+    return True
+
+
+async def _deliver_websocket(alert: Alert) -> bool:
+    await broadcast_detection(
+        alert.user_id,
+        {
+            "type": "hazard_detected",
+            "baby_profile_id": alert.profile_id,
+            "camera_type": alert.camera_type,
+            "class_id": alert.model_index,
+            "class_name": alert.class_name,
+            "risk_level": alert.risk_level,
+            "confidence": alert.confidence,
+            "detection_id": alert.detection_id,
+            "escalated": alert.escalated,
+            "timestamp": alert.created_at.isoformat()
+        }
+    )
+    return True
+
+
+async def _deliver_push(alert: Alert) -> bool:
+    if not alert.user_id:
+        return True
+
+    def send():
+        db = DetectionSessionLocal()
+        try:
+            tokens = [t.token for t in db.query(UserFCMToken).filter_by(user_id=alert.user_id).all()]
+        finally:
+            db.close()
+        if tokens:
+            send_push_notifications(
+                tokens, _hazard_push_message(alert), config.FIREBASE_PROJECT_ID, config.GOOGLE_CREDENTIALS_PATH,
+                session_factory=DetectionSessionLocal
+            )
+
+    await asyncio.to_thread(send)
+    return True
+
+
+async def _store_duration(alert: Alert) -> bool:
+    # The duration can be known before the row is stored, so wait for the persist stage first
+    await alert.settled.wait()
+    if alert.detection_id is None:
+        return False
+    await detection_writer.update_duration(alert.detection_id, alert.duration_seconds)
+    return True
+
+
+# The alert will never be stored
+def _abandon(alert: Alert):
+    alert.settled.set()
+
+
+# An alert abandoned after its image was written would leave orphan files (image and renditions) behind
+def _abandon_stored_image(alert: Alert):
+    alert.settled.set()
+    for file_path in detection_image_files(alert.file_path):
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError as e:
+            print(f"[WARNING] Could not remove dropped alert image {file_path}: {e}")
+
+
+# FCM message for a hazard alert
+def _hazard_push_message(alert: Alert) -> dict:
+    body = f"Object detected: {alert.class_name} ({alert.camera_type}) - Risk Level: {alert.risk_level}"
+    return {
+        "message": {
+            "notification": {
+                "title": "⚠️ Hazard Detected",
+                "body": body
+            },
+            "android": {
+                "priority": "high",
+                "notification": {
+                    "channel_id": "high_importance_channel",
+                    "default_sound": True,
+                    "default_vibrate_timings": True,
+                    "default_light_settings": True
+                }
+            },
+            "apns": {
+                "payload": {
+                    "aps": {
+                        "sound": "notification_sound.aiff",
+                        "badge": 1,
+                        "alert": {
+                            "title": "⚠️ Hazard Detected",
+                            "body": body
+                        }
+                    }
+                }
+            },
+            "data": {
+                "click_action": "FLUTTER_NOTIFICATION_CLICK",
+                "type": "detection_alert"
+            }
+        }
+    }
+
+
+# Shared pipeline used by all detection loops (workers start on the first alert)
+alert_pipeline = AlertPipeline(
+    config.ALERT_QUEUE_SIZE,
+    config.ALERT_OVERFLOW_POLICY,
+    config.ALERT_IMAGE_WORKERS,
+    config.ALERT_PUSH_WORKERS,
+    config.DETECTION_WRITE_BATCH_SIZE,  # One waiting insert per row in a full batch
+)
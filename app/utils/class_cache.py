@@ -0,0 +1,87 @@
+import threading
+from collections import namedtuple
+import numpy as np
+from app.models.class_model import ClassObject
+from app.utils.config import config
+from database.database import DetectionSessionLocal
+
+# Class metadata needed by the detection loop
+ClassInfo = namedtuple("ClassInfo", ["id", "name", "risk_level"])
+
+
+# Per-class setting, or the system default when the class has none
+def _or_default(value, default):
+    return default if value is None else value
+
+
+class ClassTable:
+    """The classes of one (profile, camera) pair, indexed by their model_index."""
+
+    def __init__(self, classes):
+        size = max((c.model_index for c in classes if c.model_index is not None), default=-1) + 1
+        self.classes = [None] * size  # model_index -> ClassInfo (None for unused indexes)
+        self.thresholds = np.full(size, np.inf)  # model_index -> confidence threshold (inf never alerts)
+        self.cooldowns = np.zeros(size)  # model_index -> seconds between alerts
+        for c in classes:
+            if c.model_index is not None:
+                self.classes[c.model_index] = ClassInfo(c.id, c.name, c.risk_level.value)
+                self.thresholds[c.model_index] = _or_default(c.confidence_threshold, config.DETECTION_CONFIDENCE_THRESHOLD)
+                self.cooldowns[c.model_index] = _or_default(c.cooldown_seconds, config.DETECTION_COOLDOWN_SECONDS)
+
+    def lookup(self, model_index: int):
+        """Returns the ClassInfo for a model output index, or None if the model knows more classes than the DB."""
+        if 0 <= model_index < len(self.classes):
+            return self.classes[model_index]
+        return None
+
+
+class ClassCache:
+    """
+    In-memory class tables for the cameras being monitored.
+
+    Tables are loaded once from the DB and reused for every frame. Anything that
+    changes a profile's classes must call invalidate() after committing, and the
+    next get() reloads them.
+    """
+
+    def __init__(self):
+        self._tables = {}  # (profile_id, camera_type) -> ClassTable
+        self._generation = 0  # Incremented on every invalidation
+        self._lock = threading.Lock()
+
+    def get_cached(self, profile_id: int, camera_type: str):
+        """Returns the cached table without touching the DB (None if not loaded)."""
+        return self._tables.get((profile_id, camera_type))
+
+    def get(self, profile_id: int, camera_type: str) -> ClassTable:
+        """Returns the table, loading it with a short-lived session if needed (blocking)."""
+        key = (profile_id, camera_type)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        with self._lock:
+            generation = self._generation
+        db = DetectionSessionLocal()
+        try:
+            table = ClassTable(db.query(ClassObject).filter_by(baby_profile_id=profile_id, camera_type=camera_type).all())
+        finally:
+            db.close()
+
+        # Don't cache a table that was invalidated while it was loading
+        with self._lock:
+            if self._generation == generation:
+                self._tables[key] = table
+        return table
+
+    def invalidate(self, profile_id: int, camera_type: str = None):
+        """Drops the cached table of one camera, or of every camera of the profile."""
+        with self._lock:
+            self._generation += 1
+            for key in list(self._tables):
+                if key[0] == profile_id and (camera_type is None or key[1] == camera_type):
+                    del self._tables[key]
+
+
+# Shared class cache used by the detection loops
+class_cache = ClassCache()
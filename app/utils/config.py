@@ -22,6 +22,56 @@ class Config:
     GOOGLE_CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
     FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
 
+    # Operator access to server-wide runtime stats (X-Monitoring-Token header); unset disables the endpoint
+    MONITORING_TOKEN = os.getenv("MONITORING_TOKEN")
+
+    # Detection runtime settings
+    # Model input size (pixels), frames are decoded no smaller than this. The ESP32 firmware sends VGA (640x480),
+    # so reduced-scale decoding only kicks in below 640 (e.g. 320 decodes at 1/2, 160 at 1/4)
+    INFERENCE_IMAGE_SIZE = int(os.getenv("INFERENCE_IMAGE_SIZE", 640))
+    MODEL_CACHE_MAX_MB = int(os.getenv("MODEL_CACHE_MAX_MB", 512))  # Memory budget for cached YOLO models
+    INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 2))  # Size of the inference worker pool
+    INFERENCE_MODE = os.getenv("INFERENCE_MODE", "thread")  # 'thread' or 'process' (spawned workers, each loading its own model copies)
+    INFERENCE_CPU_BUDGET = float(os.getenv("INFERENCE_CPU_BUDGET", 0.8))  # Target share of inference worker capacity
+    SAMPLER_MIN_INTERVAL = float(os.getenv("SAMPLER_MIN_INTERVAL", 0.2))  # Seconds between frames when the scene is active
+    SAMPLER_MAX_INTERVAL = float(os.getenv("SAMPLER_MAX_INTERVAL", 2.0))  # Seconds between frames when the scene is static
+    MOTION_GATE_THRESHOLD = float(os.getenv("MOTION_GATE_THRESHOLD", 4.0))  # Mean pixel change (0-255) needed to run YOLO, 0 disables
+    MOTION_GATE_MAX_SKIP_SECONDS = float(os.getenv("MOTION_GATE_MAX_SKIP_SECONDS", 10.0))  # Force an analysis at least this often
+    DETECTION_CONFIDENCE_THRESHOLD = float(os.getenv("DETECTION_CONFIDENCE_THRESHOLD", 0.5))  # Min confidence for an alert
+    DETECTION_COOLDOWN_SECONDS = float(os.getenv("DETECTION_COOLDOWN_SECONDS", 5.0))  # Min seconds between alerts for the same class
+    ALERT_CONFIRMATION = os.getenv("ALERT_CONFIRMATION", "off")  # 'off', 'n_of_m' or 'ema' multi-frame confirmation
+    ALERT_ESCALATION_DELTA = float(os.getenv("ALERT_ESCALATION_DELTA", 0.0))  # Re-alert a tracked object when its confidence rises this much, 0 disables
+    ALERT_CONFIRM_N = int(os.getenv("ALERT_CONFIRM_N", 3))  # 'n_of_m': frames an object must be seen in...
+    ALERT_CONFIRM_M = int(os.getenv("ALERT_CONFIRM_M", 5))  # ...out of the last M analysed frames
+    ALERT_CONFIRM_EMA_ALPHA = float(os.getenv("ALERT_CONFIRM_EMA_ALPHA", 0.5))  # 'ema': weight of the newest frame
+    TRACKER_IOU_THRESHOLD = float(os.getenv("TRACKER_IOU_THRESHOLD", 0.3))  # Min overlap to match a box to a track
+    TRACKER_MAX_MISSED = int(os.getenv("TRACKER_MAX_MISSED", 5))  # Analysed frames without a match before a track ends
+
+    # Alert pipeline settings
+    ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", 100))  # Max alerts waiting in each pipeline stage
+    ALERT_OVERFLOW_POLICY = os.getenv("ALERT_OVERFLOW_POLICY", "drop_oldest")  # 'drop_oldest' or 'drop_newest' when a stage is full
+    ALERT_IMAGE_WORKERS = int(os.getenv("ALERT_IMAGE_WORKERS", 2))  # Workers annotating and writing detection images
+    ALERT_PUSH_WORKERS = int(os.getenv("ALERT_PUSH_WORKERS", 2))  # Workers sending FCM push notifications
+    DETECTION_WRITE_BATCH_SIZE = int(os.getenv("DETECTION_WRITE_BATCH_SIZE", 50))  # Max detection rows per bulk insert
+    DETECTION_WRITE_FLUSH_MS = int(os.getenv("DETECTION_WRITE_FLUSH_MS", 500))  # Max time a detection row waits before a flush
+
+    # Database connection pool settings (API requests)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))  # Persistent connections kept open
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))  # Extra connections allowed under bursts
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Reopen connections older than this (seconds), -1 disables
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Check connections before handing them out
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))  # Server-side statement timeout, 0 disables
+
+    # Database pool for the detection runtime (loops, alert pipeline, writer), separate from API requests
+    DETECTION_DB_POOL_SIZE = int(os.getenv("DETECTION_DB_POOL_SIZE", 4))  # Persistent connections (writer + push workers + class loads)
+    DETECTION_DB_MAX_OVERFLOW = int(os.getenv("DETECTION_DB_MAX_OVERFLOW", 4))  # Extra connections allowed under bursts
+    DETECTION_DB_POOL_TIMEOUT = int(os.getenv("DETECTION_DB_POOL_TIMEOUT", 10))  # Seconds to wait for a free connection
+
+    # Background cleanup jobs (files and Drive folders of deleted profiles)
+    CLEANUP_POLL_SECONDS = float(os.getenv("CLEANUP_POLL_SECONDS", 5))  # How often the worker looks for due jobs
+    CLEANUP_MAX_ATTEMPTS = int(os.getenv("CLEANUP_MAX_ATTEMPTS", 8))  # Jobs failing this many times are kept but no longer retried
+
 # Instantiate the config for use across the application
 config = Config()
 
@@ -1,40 +1,70 @@
-import os
-from ultralytics import YOLO
-import cv2
 import asyncio
+import time
 from datetime import datetime
-from app.models.detection_result_model import DetectionResult
-from app.models.class_model import ClassObject
 from app.utils.fcm_push import send_push_notifications
 from app.models.user_model import User, UserFCMToken
 from app.models.baby_profile_model import BabyProfile
 from app.utils.config import config
 from app.utils.websocket_broadcast import broadcast_detection
-from app.utils.esp32_stream_buffer import ESP32StreamBuffer
-from database.database import SessionLocal
+from app.utils.esp32_stream_buffer import acquire_stream_buffer, release_stream_buffer
+from app.utils.model_registry import model_registry
+from app.utils.inference_executor import inference_executor
+from app.utils.frame_sampler import AdaptiveFrameSampler
+from app.utils.detection_metrics import CameraMetrics, camera_metrics
+from app.utils.motion_gate import MotionGate
+from app.utils.stream_relay import stream_relays
+from app.utils.alert_pipeline import Alert, alert_pipeline
+from app.utils.detection_writer import detection_writer
+from app.utils.file_reaper import file_reaper
+from app.utils.class_cache import class_cache
+from app.utils.detection_postprocess import ClassCooldowns, alert_mask, select_alerts
+from app.utils.tracking import TrackAlerts
+from database.database import DetectionSessionLocal, db_pool_stats
 
 # Dictionary to track currently running detection tasks per camera
 running_tasks = {}
 
-# Dictionary to avoid sending repeated alerts for same class within short period
-last_detection_time = {}  # key: profile_camera_class, value: datetime
-
-# Dictionary to hold active frame buffers from ESP32 streams
-stream_buffers = {}  # key: profile_id_camera_type, value: ESP32StreamBuffer
-
 # Start the detection loop for a given baby profile and camera
-async def start_detection_loop(profile_id: int, camera_type: str, ip: str, user_id: int, model_path: str, db, camera_profiles):
-    model = YOLO(model_path)
+async def start_detection_loop(profile_id: int, camera_type: str, ip: str, user_id: int, model_path: str, camera_profiles):
     stream_url = f"http://{ip}/stream"
     should_stop = False
     buffer_key = f"{profile_id}_{camera_type}"
 
-    # Reuse existing stream buffer or create a new one
-    stream_buffer = stream_buffers.get(buffer_key)
-    if stream_buffer is None:
-        stream_buffer = ESP32StreamBuffer(stream_url)
-        stream_buffer.start()
-        stream_buffers[buffer_key] = stream_buffer
+    # Load the camera's class table up front so the first detection doesn't wait on the DB.
+    # Done before acquiring the model and the camera connection, so a failing DB leaves nothing to release.
+    await asyncio.to_thread(class_cache.get, profile_id, camera_type)
+
+    # Get a shared, warmed-up model instance (loaded off the event loop on first use; None in process mode, where the workers hold it)
+    model_key, model = await asyncio.to_thread(model_registry.acquire, model_path)
+
+    # Reuse the camera's shared stream buffer (e.g. already opened by live viewers) or create it.
+    # Nothing awaits between here and registering release_resources below, so the connection can't leak.
+    stream_buffer = acquire_stream_buffer(buffer_key, stream_url)
+
+    # Per-camera frame pacing, motion gating and metrics
+    sampler = AdaptiveFrameSampler()
+    motion_gate = MotionGate()
+    metrics = CameraMetrics()
+    cooldowns = ClassCooldowns()  # Per-class alert dedupe, owned by this loop
+    # Alerts follow tracked objects: one on appearance, optionally more on escalation
+    track_alerts = TrackAlerts(
+        config.ALERT_CONFIRMATION, config.ALERT_CONFIRM_N, config.ALERT_CONFIRM_M, config.ALERT_CONFIRM_EMA_ALPHA,
+        config.TRACKER_IOU_THRESHOLD, config.TRACKER_MAX_MISSED, config.ALERT_ESCALATION_DELTA
+    )
+    camera_metrics[buffer_key] = metrics
+
+    # Decode the frame close to the model's input size and run the motion gate on it.
+    # Runs on a worker thread: a full-frame decode plus the gate's resize/diff would otherwise block the event loop.
+    def prepare_frame(jpeg, frame_id):
+        frame, scale = stream_buffer.decode(jpeg, frame_id, config.INFERENCE_IMAGE_SIZE)
+        if frame is None:
+            return None, scale, False
+        return frame, scale, motion_gate.should_analyse(frame)
+
+    # Wait before the next frame, based on scene activity and inference load
+    async def pace(active: bool, frame_started: float):
+        metrics.sample_interval = sampler.next_interval(active, inference_executor.utilization())
+        await asyncio.sleep(max(0.0, metrics.sample_interval - (time.monotonic() - frame_started)))
 
     # Main detection loop
     async def detect():
@@ -43,26 +73,31 @@ async def start_detection_loop(profile_id: int, camera_type: str, ip: str, user_
         open_fail_count = 0
         max_read_fail_count = 10
         max_open_fail_count = 3 
+        last_frame_id = None
         try:
             while True:
+                if should_stop:
+                    print(f"[STOPPING] Gracefully exiting detect loop for {profile_id}-{camera_type}")
+                    break
                 try:
-                    frame = stream_buffer.get_latest_frame()
+                    frame_started = time.monotonic()
+                    jpeg, frame_id = stream_buffer.get_latest_jpeg()
 
                     # Handle frame read failure
-                    if frame is None:
+                    if jpeg is None:
                         read_fail_count += 1
                         print(f"[WARNING] Failed to read frame ({(read_fail_count * open_fail_count) + read_fail_count} time(s))")
 
                         if read_fail_count >= max_read_fail_count:
                             if open_fail_count < max_open_fail_count:
                                 open_fail_count += 1
-                                print("[RECONNECT] VideoCapture not opened, retrying...")
+                                print("[RECONNECT] Stream not opened, retrying...")
                                 stream_buffer.restart()
                                 read_fail_count = 0
                                 continue
                             else:
                                 print(f"[DISCONNECTED] Camera for Profile {profile_id} - {camera_type}")
-                                await notify_disconnection_and_stop(profile_id, camera_type, user_id, camera_profiles, db)
+                                await notify_disconnection_and_stop(profile_id, camera_type, user_id, camera_profiles)
                                 break
                         await asyncio.sleep(0.5)
                         continue
@@ -70,121 +105,71 @@ async def start_detection_loop(profile_id: int, camera_type: str, ip: str, user_
                         read_fail_count = 0
                         open_fail_count = 0
 
-                    # Run YOLO detection on the frame
-                    results = model(frame)[0]
-                    now = datetime.utcnow()
-
-                    for xyxy, conf, cls in zip(results.boxes.xyxy, results.boxes.conf, results.boxes.cls):
-                        if conf > 0.5:
-                            class_id = int(cls)
-                            key = f"{profile_id}_{camera_type}_{class_id}"
-                            last_time = last_detection_time.get(key)
-
-                            # Avoid duplicate detections within 5 seconds
-                            if not last_time or (now - last_time).total_seconds() > 5:
-                                last_detection_time[key] = now
-
-                                # Fetch class metadata from DB
-                                class_obj = db.query(ClassObject).filter_by(
-                                    baby_profile_id=profile_id,
-                                    camera_type=camera_type,
-                                    model_index=class_id
-                                ).first()
-                                class_name = class_obj.name if class_obj else "unknown"
-                                risk_level = class_obj.risk_level if class_obj else "unknown"
-                                conf_value = float(conf.item()) if hasattr(conf, 'item') else float(conf)
-
-                                print(f"[DETECTED] Profile {profile_id}, Class {class_id}, Confidence {conf_value:.2f}")
-                                
-                                # Save detection image and update DB
-                                base_path = "uploads/detections"
-                                relative_path = save_detection_image(base_path, profile_id, camera_type, class_name, class_obj.id, xyxy, conf_value, frame)
-
-                                detection = DetectionResult(
-                                    baby_profile_id=profile_id,
-                                    class_id=class_obj.id,
-                                    class_name=class_name,
-                                    confidence=conf_value,
-                                    camera_type=camera_type,
-                                    image_path=relative_path
-                                )
-                                db.add(detection)
-                                db.commit()
-
-                                # Send WebSocket alert to frontend
-                                await broadcast_detection(
-                                    user_id,
-                                    {
-                                        "type": "hazard_detected",
-                                        "baby_profile_id": profile_id,
-                                        "camera_type": camera_type,
-                                        "class_id": class_id,
-                                        "class_name": class_name,
-                                        "risk_level": risk_level.value,
-                                        "confidence": conf_value,
-                                        "detection_id": detection.id,
-                                        "timestamp": datetime.now().isoformat()
-                                    }
-                                )
-
-                                # Send FCM push notification to mobile
-                                if user_id:
-                                    try:
-                                        fresh_db = SessionLocal()
-                                        try:
-                                            tokens = [t.token for t in fresh_db.query(UserFCMToken).filter_by(user_id=user_id).all()]
-                                            if tokens:
-                                                await asyncio.to_thread(
-                                                    send_push_notifications,
-                                                    tokens,
-                                                    {
-                                                        "message": {
-                                                            "notification": {
-                                                                "title": "⚠️ Hazard Detected",
-                                                                "body": f"Object detected: {class_name} ({camera_type}) - Risk Level: {risk_level.value}"
-                                                            },
-                                                            "android": {
-                                                                "priority": "high",
-                                                                "notification": {
-                                                                    "channel_id": "high_importance_channel",
-                                                                    "default_sound": True,
-                                                                    "default_vibrate_timings": True,
-                                                                    "default_light_settings": True
-                                                                }
-                                                            },
-                                                            "apns": {
-                                                                "payload": {
-                                                                    "aps": {
-                                                                        "sound": "notification_sound.aiff",
-                                                                        "badge": 1,
-                                                                        "alert": {
-                                                                            "title": "⚠️ Hazard Detected",
-                                                                            "body": f"Object detected: {class_name} ({camera_type}) - Risk Level: {risk_level.value}"
-                                                                        }
-                                                                    }
-                                                                }
-                                                            },
-                                                            "data": {
-                                                                "click_action": "FLUTTER_NOTIFICATION_CLICK",
-                                                                "type": "detection_alert"
-                                                            }
-                                                        }
-                                                    },
-                                                    config.FIREBASE_PROJECT_ID,
-                                                    config.GOOGLE_CREDENTIALS_PATH
-                                                )
-                                        finally:
-                                            fresh_db.close()
-                                    except Exception as e:
-                                        print(f"[WARNING] Failed to send push notifications: {e}")
-                                        import traceback
-                                        print(f"[DEBUG] Full traceback: {traceback.format_exc()}")
-
-                    await asyncio.sleep(0.5)
-
-                    if should_stop:
-                        print(f"[STOPPING] Gracefully exiting detect loop for {profile_id}-{camera_type}")
-                        break
+                    # Nothing new from the camera since the last frame we looked at
+                    if frame_id == last_frame_id:
+                        await asyncio.sleep(sampler.min_interval)
+                        continue
+                    last_frame_id = frame_id
+
+                    # Decode off the event loop; boxes are mapped back to full size with `scale`
+                    frame, scale, changed = await asyncio.to_thread(prepare_frame, jpeg, frame_id)
+                    if frame is None:
+                        print(f"[WARNING] Failed to decode frame {frame_id} for {profile_id}-{camera_type}")
+                        await asyncio.sleep(sampler.min_interval)
+                        continue
+
+                    # Skip inference when the scene hasn't changed since the last analysed frame
+                    if not changed:
+                        metrics.record_skipped()
+                        await pace(False, frame_started)
+                        continue
+
+                    # Run YOLO detection on the inference pool (None means a newer frame replaced this one)
+                    results = await inference_executor.infer(buffer_key, model_key, model, frame)
+                    if results is None:
+                        continue
+                    metrics.record_analysed()
+                    now = time.monotonic()
+
+                    # Class metadata comes from memory; it's only reloaded after the classes change
+                    class_table = class_cache.get_cached(profile_id, camera_type)
+                    if class_table is None:
+                        class_table = await asyncio.to_thread(class_cache.get, profile_id, camera_type)
+
+                    # Classes alerted on within their cooldown window are skipped
+                    blocked = cooldowns.blocked(class_table.cooldowns, now)
+
+                    # Track confident boxes; only new (confirmed) or escalated objects may alert
+                    confident = alert_mask(results.cls, results.conf, class_table.thresholds)
+                    eligible, tracks = track_alerts.update(results, class_table.thresholds, confident, now)
+
+                    # Best box per class above its threshold, computed over the whole result at once
+                    for index in select_alerts(results, class_table.thresholds, blocked, eligible):
+                        class_id = int(results.cls[index])
+                        class_obj = class_table.lookup(class_id)
+                        if class_obj is None:
+                            continue
+                        cooldowns.record(class_id, now)
+                        conf_value = float(results.conf[index])
+                        escalated = bool(tracks[index].alerts)
+
+                        print(f"[DETECTED] Profile {profile_id}, Class {class_id}, Confidence {conf_value:.2f}{' (escalated)' if escalated else ''}")
+
+                        # Image writing, DB insert, WebSocket and push run on the alert pipeline workers
+                        alert = Alert(
+                            profile_id, camera_type, user_id, class_id, class_obj.id, class_obj.name,
+                            class_obj.risk_level, conf_value, results.xyxy[index] * scale, jpeg, escalated
+                        )
+                        alert_pipeline.submit(alert)
+                        track_alerts.mark_alerted(tracks[index], alert)
+
+                    # Objects that left the view: store how long they were there
+                    for track in track_alerts.pop_ended():
+                        for alert in track.alerts:
+                            alert_pipeline.record_duration(alert, track.duration)
+
+                    # Sample faster while something is in view or moving, slower when static or under load
+                    await pace(motion_gate.motion_detected or bool(confident.any()), frame_started)
                 except asyncio.CancelledError:
                     should_stop = True
                     print(f"[CANCEL RECEIVED] Marked detect loop for graceful exit")
@@ -192,37 +177,82 @@ async def start_detection_loop(profile_id: int, camera_type: str, ip: str, user_
         except Exception as e:
             print(f"[ERROR] Detection loop failed: {e}")
         finally:
+            for track in track_alerts.end_all():
+                for alert in track.alerts:
+                    alert_pipeline.record_duration(alert, track.duration)
             print(f"[STOPPED] Detection for Profile {profile_id} - {camera_type}")
 
     # Track this detection loop as an active task
     task_id = f"{profile_id}_{camera_type}"
-    running_tasks[task_id] = asyncio.create_task(detect())
+    task = asyncio.create_task(detect())
+    inference_executor.attach(buffer_key, model_key)
+
+    # Release the shared model and stream whenever the task ends (even if cancelled before it started)
+    def release_resources(_):
+        inference_executor.detach(buffer_key, model_key)
+        model_registry.release(model_key)
+        release_stream_buffer(buffer_key)
+        class_cache.invalidate(profile_id, camera_type)
+        if camera_metrics.get(buffer_key) is metrics:
+            del camera_metrics[buffer_key]
+
+    task.add_done_callback(release_resources)
+    running_tasks[task_id] = task
     return task_id
 
+# Per-camera snapshot of the detection runtime for monitoring (optionally limited to some profiles)
+def get_detection_stats(profile_ids=None):
+    cameras = {}
+    for key, metrics in list(camera_metrics.items()):
+        profile_id = int(key.split("_", 1)[0])
+        if profile_ids is None or profile_id in profile_ids:
+            cameras[key] = metrics.snapshot()
+
+    relays = {}
+    for (key, variant), relay in list(stream_relays.items()):
+        profile_id = int(key.split("_", 1)[0])
+        if profile_ids is None or profile_id in profile_ids:
+            relays.setdefault(key, {})[variant] = relay.stats()
+
+    return {
+        "cameras": cameras,
+        "relays": relays,
+    }
+
+# Server-wide runtime state (shared pools, queues, model paths of every user) for operators only
+def get_runtime_stats():
+    return {
+        "inference": inference_executor.stats(),
+        "models": model_registry.stats(),
+        "alerts": alert_pipeline.stats(),
+        "writer": detection_writer.stats(),
+        "file_reaper": file_reaper.stats(),
+        "db_pool": db_pool_stats(),
+    }
+
 # Stop a running detection task and clean up
 async def stop_detection_loop(profile_id: int, camera_type: str):
-    keys_to_remove = [key for key in last_detection_time if key.startswith(f"{profile_id}_{camera_type}_")]
-    for key in keys_to_remove:
-        del last_detection_time[key]
-
     task_id = f"{profile_id}_{camera_type}"
     task = running_tasks.pop(task_id, None)
     if task:
         task.cancel()
         print(f"[CANCELLED] Detection task for {task_id}")
 
-    buffer_key = f"{profile_id}_{camera_type}"
-    stream_buffer = stream_buffers.pop(buffer_key, None)
-    if stream_buffer:
-        stream_buffer.stop()
-
 # Handle camera disconnection: notify, clean up, and stop monitoring
-async def notify_disconnection_and_stop(profile_id: int, camera_type: str, user_id: int, camera_profiles, db):
+async def notify_disconnection_and_stop(profile_id: int, camera_type: str, user_id: int, camera_profiles):
     try:
         from app.services.monitoring_service import stop_monitoring_service
 
-        baby_profile = db.query(BabyProfile).filter_by(id=profile_id).first()
-        if baby_profile:
+        # Read what the notifications need with a short-lived session, released before any network call
+        db = DetectionSessionLocal()
+        try:
+            baby_profile = db.query(BabyProfile).filter_by(id=profile_id).first()
+            profile_name = baby_profile.name if baby_profile else None
+            tokens = [t.token for t in db.query(UserFCMToken).filter_by(user_id=user_id).all()] if baby_profile and user_id else []
+        finally:
+            db.close()
+
+        if profile_name is not None:
             await broadcast_detection(
                 user_id,
                 {
@@ -233,52 +263,47 @@ async def notify_disconnection_and_stop(profile_id: int, camera_type: str, user_
                 }
             )
 
-            if user_id:
-                fresh_db = SessionLocal()
-                try:
-                    tokens = [t.token for t in fresh_db.query(UserFCMToken).filter_by(user_id=user_id).all()]
-                    if tokens:
-                        await asyncio.to_thread(
-                            send_push_notifications,
-                            tokens,
-                            {
-                                "message": {
-                                    "notification": {
-                                        "title": "📷 Camera Disconnected",
-                                        "body": f"{camera_type.replace('_', ' ').title()} for '{baby_profile.name}' has been disconnected"
-                                    },
-                                    "android": {
-                                        "priority": "high",
-                                        "notification": {
-                                            "channel_id": "high_importance_channel",
-                                            "default_sound": True,
-                                            "default_vibrate_timings": True,
-                                            "default_light_settings": True
-                                        }
-                                    },
-                                    "apns": {
-                                        "payload": {
-                                            "aps": {
-                                                "sound": "notification_sound.aiff",
-                                                "badge": 1,
-                                                "alert": {
-                                                    "title": "📷 Camera Disconnected",
-                                                    "body": f"{camera_type.replace('_', ' ').title()} for '{baby_profile.name}' has been disconnected"
-                                                }
-                                            }
+            if tokens:
+                await asyncio.to_thread(
+                    send_push_notifications,
+                    tokens,
+                    {
+                        "message": {
+                            "notification": {
+                                "title": "📷 Camera Disconnected",
+                                "body": f"{camera_type.replace('_', ' ').title()} for '{profile_name}' has been disconnected"
+                            },
+                            "android": {
+                                "priority": "high",
+                                "notification": {
+                                    "channel_id": "high_importance_channel",
+                                    "default_sound": True,
+                                    "default_vibrate_timings": True,
+                                    "default_light_settings": True
+                                }
+                            },
+                            "apns": {
+                                "payload": {
+                                    "aps": {
+                                        "sound": "notification_sound.aiff",
+                                        "badge": 1,
+                                        "alert": {
+                                            "title": "📷 Camera Disconnected",
+                                            "body": f"{camera_type.replace('_', ' ').title()} for '{profile_name}' has been disconnected"
                                         }
-                                    },
-                                    "data": {
-                                        "click_action": "FLUTTER_NOTIFICATION_CLICK",
-                                        "type": "Camera_Disconnection"
                                     }
                                 }
                             },
-                            config.FIREBASE_PROJECT_ID,
-                            config.GOOGLE_CREDENTIALS_PATH
-                        )
-                finally:
-                    fresh_db.close()
+                            "data": {
+                                "click_action": "FLUTTER_NOTIFICATION_CLICK",
+                                "type": "Camera_Disconnection"
+                            }
+                        }
+                    },
+                    config.FIREBASE_PROJECT_ID,
+                    config.GOOGLE_CREDENTIALS_PATH,
+                    DetectionSessionLocal
+                )
 
         await stop_detection_loop(profile_id, camera_type)
 
@@ -286,36 +311,11 @@ async def notify_disconnection_and_stop(profile_id: int, camera_type: str, user_
         active_sessions = [key for key in running_tasks.keys() if key.startswith(f"{profile_id}_")]
         if not active_sessions:
             print(f"[INFO] All cameras for Profile {profile_id} disconnected. Stopping monitoring.")
-            await stop_monitoring_service(camera_profiles, db)
+            db = DetectionSessionLocal()
+            try:
+                await stop_monitoring_service(camera_profiles, db)
+            finally:
+                db.close()
 
     except Exception as e:
         print(f"[ERROR] Failed to handle disconnection and stop detection: {e}")
-
-# Save an annotated image of the detection
-def save_detection_image(base_path, baby_profile_id, camera_type, class_name, class_id, xyxy_tensor, confidence, frame):
-    folder = os.path.join(base_path, str(baby_profile_id), camera_type)
-    os.makedirs(folder, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    conf_str = f"{confidence:.2f}"
-    filename = f"{timestamp}_class_id_{class_id}_{class_name}_conf_{conf_str}.jpg"
-    file_path = os.path.join(folder, filename)
-
-    xyxy = xyxy_tensor.cpu().numpy().astype(int)
-    x1, y1, x2, y2 = xyxy
-
-    # Draw bounding box and label on the image
-    label_text = f"{class_name} ({conf_str})"
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    font_scale = 0.6
-    thickness = 2
-    text_size, _ = cv2.getTextSize(label_text, font, font_scale, thickness)
-
-    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-    cv2.rectangle(frame, (x1, y1), (x1 + text_size[0] + 10, y1 + text_size[1] + 10), (0, 255, 0), cv2.FILLED)
-    cv2.putText(frame, label_text, (x1 + 5, y1 + text_size[1] + 5), font, font_scale, (0, 0, 0), thickness)
-
-    cv2.imwrite(file_path, frame)
-
-    relative_path = os.path.join("detections", str(baby_profile_id), camera_type, filename)
-    return relative_path
@@ -0,0 +1,109 @@
+import os
+import uuid
+import cv2
+import numpy as np
+from collections import namedtuple
+from datetime import datetime
+
+# Folder (relative to uploads/) holding annotated detection images
+DETECTIONS_DIR = "detections"
+
+# Downscaled copy of a detection image: max width (pixels) and JPEG quality (0-100)
+ImageRendition = namedtuple("ImageRendition", ["width", "quality"])
+
+# Available image sizes; "full" is the annotated image as written
+IMAGE_RENDITIONS = {
+    "full": None,
+    "medium": ImageRendition(width=480, quality=75),
+    "thumb": ImageRendition(width=160, quality=60),
+}
+
+
+# Build (file_path, relative_path) for a new detection image without writing anything yet
+def detection_image_path(base_path, baby_profile_id, camera_type, class_name, class_id, confidence):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    filename = f"{timestamp}_class_id_{class_id}_{class_name}_conf_{confidence:.2f}.jpg"
+    file_path = os.path.join(base_path, str(baby_profile_id), camera_type, filename)
+    relative_path = os.path.join(DETECTIONS_DIR, str(baby_profile_id), camera_type, filename)
+    return file_path, relative_path
+
+
+# Draw the detection box and label on the frame and write it to file_path.
+# Draws in place: pass a frame the caller owns (e.g. freshly decoded), not a shared stream frame.
+def write_detection_image(file_path, class_name, xyxy_box, confidence, frame):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    x1, y1, x2, y2 = np.asarray(xyxy_box).astype(int)
+
+    # Draw bounding box and label on the image
+    label_text = f"{class_name} ({confidence:.2f})"
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    font_scale = 0.6
+    thickness = 2
+    text_size, _ = cv2.getTextSize(label_text, font, font_scale, thickness)
+
+    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    cv2.rectangle(frame, (x1, y1), (x1 + text_size[0] + 10, y1 + text_size[1] + 10), (0, 255, 0), cv2.FILLED)
+    cv2.putText(frame, label_text, (x1 + 5, y1 + text_size[1] + 5), font, font_scale, (0, 0, 0), thickness)
+
+    if not cv2.imwrite(file_path, frame):
+        return False
+
+    # Renditions are a cache (rebuilt on request if missing), so a failure here doesn't fail the image
+    for size in IMAGE_RENDITIONS:
+        if IMAGE_RENDITIONS[size] is not None:
+            _write_rendition(frame, rendition_path(file_path, size), IMAGE_RENDITIONS[size])
+    return True
+
+
+# Path of a downscaled copy: <image folder>/renditions/<size>/<image file name>
+def rendition_path(file_path, size):
+    if IMAGE_RENDITIONS.get(size) is None:
+        return file_path
+    return os.path.join(os.path.dirname(file_path), "renditions", size, os.path.basename(file_path))
+
+
+# Every file stored for a detection image (the image and its renditions), e.g. to delete them
+def detection_image_files(file_path):
+    return [rendition_path(file_path, size) for size in IMAGE_RENDITIONS]
+
+
+# Path of the requested size of a detection image, creating the rendition on first use
+# (images saved before renditions existed, or whose rendition was lost). Returns None if the image is missing.
+def get_detection_image_rendition(file_path, size):
+    path = rendition_path(file_path, size)
+    if os.path.exists(path):
+        return path
+    if path == file_path or not os.path.exists(file_path):
+        return None
+    frame = cv2.imread(file_path, cv2.IMREAD_COLOR)
+    if frame is None:
+        return None
+    return path if _write_rendition(frame, path, IMAGE_RENDITIONS[size]) else None
+
+
+# Resize a frame to the rendition width and write it (via a temporary file, so readers never see a partial JPEG).
+# Each call gets its own temporary file, since several threads may render the same missing rendition at once.
+def _write_rendition(frame, path, rendition):
+    height, width = frame.shape[:2]
+    if width > rendition.width:
+        frame = cv2.resize(frame, (rendition.width, max(1, round(height * rendition.width / width))), interpolation=cv2.INTER_AREA)
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, rendition.quality])
+        if not ok:
+            return False
+        with open(temp_path, "xb") as f:
+            f.write(encoded.tobytes())
+        os.replace(temp_path, path)
+        return True
+    except OSError as e:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        # Another thread may have written the same rendition in the meantime
+        if os.path.exists(path):
+            return True
+        print(f"[WARNING] Failed to write image rendition {path}: {e}")
+        return False
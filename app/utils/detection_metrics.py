@@ -0,0 +1,48 @@
+import time
+from collections import deque
+
+
+class CameraMetrics:
+    """Rolling counters describing how a single camera's detection loop is performing."""
+
+    def __init__(self, window_seconds: float = 30.0):
+        self.window = window_seconds  # Seconds of history used for the effective FPS
+        self.started_at = time.monotonic()
+        self.frames_analysed = 0  # Frames that went through the model
+        self.frames_skipped = 0  # Frames skipped by the motion gate
+        self.sample_interval = 0.0  # Last delay chosen by the frame sampler
+        self._analysed_at = deque()  # Monotonic timestamps of recently analysed frames
+
+    def record_analysed(self):
+        self.frames_analysed += 1
+        self._analysed_at.append(time.monotonic())
+        self._trim()
+
+    def record_skipped(self):
+        self.frames_skipped += 1
+
+    def effective_fps(self) -> float:
+        """Analysed frames per second over the recent window."""
+        self._trim()
+        elapsed = min(self.window, time.monotonic() - self.started_at)
+        return len(self._analysed_at) / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self) -> dict:
+        sampled = self.frames_analysed + self.frames_skipped
+        return {
+            "effective_fps": round(self.effective_fps(), 2),
+            "sample_interval": round(self.sample_interval, 3),
+            "frames_analysed": self.frames_analysed,
+            "frames_skipped": self.frames_skipped,
+            "analysed_ratio": round(self.frames_analysed / sampled, 3) if sampled else 0.0,
+            "skipped_ratio": round(self.frames_skipped / sampled, 3) if sampled else 0.0,
+        }
+
+    def _trim(self):
+        cutoff = time.monotonic() - self.window
+        while self._analysed_at and self._analysed_at[0] < cutoff:
+            self._analysed_at.popleft()
+
+
+# Metrics for currently running detection loops
+camera_metrics = {}  # key: profile_id_camera_type, value: CameraMetrics
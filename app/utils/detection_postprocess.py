@@ -0,0 +1,93 @@
+import numpy as np
+
+
+# Per-box confidence threshold; boxes of classes without a threshold (unknown to the DB) never pass
+def _box_thresholds(cls, thresholds):
+    box_thresholds = np.full(len(cls), np.inf)
+    known = (cls >= 0) & (cls < len(thresholds))
+    box_thresholds[known] = thresholds[cls[known]]
+    return box_thresholds
+
+
+# Boolean mask of boxes above their class's confidence threshold and not blocked by a cooldown
+def alert_mask(cls, conf, thresholds, blocked=None):
+    mask = conf > _box_thresholds(cls, thresholds)
+    if blocked is not None and len(blocked):
+        known = cls < len(blocked)
+        mask[known] &= ~blocked[cls[known]]
+    return mask
+
+
+# Indexes of the boxes to alert on: the most confident qualifying box of each class, best first
+def select_alerts(detections, thresholds, blocked=None, eligible=None):
+    """
+    detections: Detections with xyxy (N, 4), conf (N,) and cls (N,) arrays.
+    thresholds: per-class confidence thresholds, indexed by model class index.
+    blocked: optional per-class boolean array, True for classes still in their cooldown.
+    eligible: optional per-box boolean array, False for boxes that may not alert (e.g. unconfirmed).
+    """
+    cls, conf = detections.cls, detections.conf
+    mask = alert_mask(cls, conf, thresholds, blocked)
+    if eligible is not None:
+        mask &= eligible
+    candidates = np.flatnonzero(mask)
+    if len(candidates) == 0:
+        return candidates
+    return _top_per_group(cls[candidates], conf[candidates], candidates)
+
+
+# Same as select_alerts() for a batch of frames in one pass; returns one index array per frame
+def select_alerts_batch(batch, thresholds, blocked=None):
+    if not batch:
+        return []
+    sizes = [len(detections.conf) for detections in batch]
+    cls = np.concatenate([detections.cls for detections in batch])
+    conf = np.concatenate([detections.conf for detections in batch])
+    frame_index = np.repeat(np.arange(len(batch)), sizes)
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    candidates = np.flatnonzero(alert_mask(cls, conf, thresholds, blocked))
+    # Group by (frame, class) so each frame keeps its own best box per class
+    groups = frame_index[candidates] * (int(cls.max(initial=0)) + 1) + cls[candidates]
+    picks = _top_per_group(groups, conf[candidates], candidates) if len(candidates) else candidates
+
+    picked_frames = frame_index[picks]
+    return [picks[picked_frames == i] - offsets[i] for i in range(len(batch))]
+
+
+# For each group keep the index with the highest confidence, ordered by confidence
+def _top_per_group(groups, conf, indexes):
+    order = np.lexsort((-conf, groups))  # By group, best confidence first within a group
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = groups[order][1:] != groups[order][:-1]
+    best = order[first]
+    return indexes[best[np.argsort(-conf[best], kind="stable")]]
+
+
+class ClassCooldowns:
+    """
+    Last alert time of each class for one camera, as a monotonic timestamp array
+    indexed by model class index.
+
+    Entries expire on their own (an old timestamp simply no longer blocks), so the
+    state never grows beyond one float per class and goes away with its loop.
+    """
+
+    def __init__(self, size: int = 0):
+        self.last_alert = np.full(size, -np.inf)
+
+    def blocked(self, cooldowns, now: float):
+        """Per-class boolean array, True for classes alerted on less than their cooldown ago."""
+        self._resize(len(cooldowns))
+        return now - self.last_alert < cooldowns
+
+    def record(self, class_id: int, now: float):
+        self._resize(class_id + 1)
+        self.last_alert[class_id] = now
+
+    def _resize(self, size: int):
+        # Follow the class table when classes are added or removed
+        if size > len(self.last_alert):
+            self.last_alert = np.concatenate((self.last_alert, np.full(size - len(self.last_alert), -np.inf)))
+        elif size < len(self.last_alert):
+            self.last_alert = self.last_alert[:size]
@@ -0,0 +1,176 @@
+import asyncio
+from sqlalchemy import bindparam, exc, insert, update
+from app.db_utils.detection_stats_utils import add_to_detection_stats
+from app.models.detection_result_model import DetectionResult
+from app.utils.config import config
+from database.database import DetectionSessionLocal
+
+
+class DetectionWriter:
+    """
+    Buffers DetectionResult inserts (and duration updates) from all cameras and writes
+    them in bulk: one multi-row INSERT ... RETURNING id and one commit per flush. The
+    hourly statistics rollup is updated in the same transaction.
+
+    A flush happens when batch_size rows are waiting or flush_interval seconds after
+    the first buffered row, whichever comes first. Callers await the id of their row,
+    so the alert pipeline can still put it in the WebSocket payload.
+
+    If the batch is rejected by the database (e.g. a row whose class or profile was
+    just deleted), the rows are retried one by one in savepoints, so only the bad
+    row fails and the other cameras' detections are still stored.
+    """
+
+    def __init__(self, batch_size: int = 50, flush_interval: float = 0.5):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._rows = []  # (values, future) waiting for the next flush
+        self._durations = []  # (detection_id, seconds, future) waiting for the next flush
+        self._timer = None
+        self._flush_lock = None  # Created on first use, bound to the running event loop
+
+        # Counters exposed for monitoring
+        self.flushes = 0
+        self.rows_written = 0
+        self.failed_flushes = 0
+        self.rejected_rows = 0
+
+    async def insert(self, values: dict) -> int:
+        """Queues a DetectionResult row and returns its id once it's committed."""
+        future = asyncio.get_running_loop().create_future()
+        self._rows.append((values, future))
+        self._schedule()
+        return await future
+
+    async def update_duration(self, detection_id: int, seconds: float):
+        future = asyncio.get_running_loop().create_future()
+        self._durations.append((detection_id, seconds, future))
+        self._schedule()
+        await future
+
+    async def flush(self):
+        """Writes up to batch_size buffered rows, plus pending duration updates, in one transaction."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            rows, self._rows = self._rows[:self.batch_size], self._rows[self.batch_size:]
+            durations, self._durations = self._durations, []
+            if not rows and not durations:
+                return
+            if self._rows:
+                self._schedule()  # More than one batch was waiting
+            try:
+                results = await asyncio.to_thread(self._write, [values for values, _ in rows], durations)
+            except Exception as e:
+                self.failed_flushes += 1
+                print(f"[ERROR] Failed to write {len(rows)} detection(s): {e}")
+                for future in [f for _, f in rows] + [f for _, _, f in durations]:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            self.flushes += 1
+            for (_, future), result in zip(rows, results):
+                if isinstance(result, Exception):
+                    self.rejected_rows += 1
+                    if not future.done():
+                        future.set_exception(result)
+                else:
+                    self.rows_written += 1
+                    if not future.done():
+                        future.set_result(result)
+            for _, _, future in durations:
+                if not future.done():
+                    future.set_result(None)
+
+    async def close(self):
+        """Final flush on shutdown."""
+        while self._rows or self._durations:
+            await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending_rows": len(self._rows),
+            "pending_updates": len(self._durations),
+            "batch_size": self.batch_size,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "failed_flushes": self.failed_flushes,
+            "rejected_rows": self.rejected_rows,
+            "avg_rows_per_flush": round(self.rows_written / self.flushes, 2) if self.flushes else 0,
+        }
+
+    def _schedule(self):
+        if len(self._rows) + len(self._durations) >= self.batch_size:
+            asyncio.ensure_future(self.flush())
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, lambda: asyncio.ensure_future(self.flush()))
+
+    def _write(self, rows, durations):
+        # Runs on a worker thread with its own short-lived session.
+        # Returns one entry per row: its new id, or the exception the database rejected it with.
+        db = DetectionSessionLocal()
+        try:
+            try:
+                ids = self._insert_rows(db, rows)
+                self._update_durations(db, durations)
+                db.commit()
+                return ids
+            except exc.DBAPIError as e:
+                db.rollback()
+                # Lost connections fail every row alike; only retry what the database refused
+                if e.connection_invalidated or not rows:
+                    raise
+                print(f"[WARNING] Batch of {len(rows)} detection(s) rejected, retrying row by row: {e.orig}")
+
+            results = []
+            for row in rows:
+                try:
+                    with db.begin_nested():
+                        results += self._insert_rows(db, [row])
+                except exc.DBAPIError as e:
+                    if e.connection_invalidated:
+                        raise
+                    print(f"[ERROR] Dropped detection (profile {row.get('baby_profile_id')}, class {row.get('class_id')}): {e.orig}")
+                    results.append(e)
+            self._update_durations(db, durations)
+            db.commit()
+            return results
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _insert_rows(db, rows):
+        if not rows:
+            return []
+        result = db.execute(
+            insert(DetectionResult).returning(DetectionResult.id, sort_by_parameter_order=True),
+            rows
+        )
+        ids = list(result.scalars())
+        add_to_detection_stats(db, rows)
+        return ids
+
+    @staticmethod
+    def _update_durations(db, durations):
+        # Core executemany on the session's connection: a detection deleted while its object was still
+        # tracked matches no row and is skipped, where the ORM's update by primary key would raise
+        if durations:
+            table = DetectionResult.__table__
+            db.connection().execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(duration_seconds=bindparam("b_seconds")),
+                [{"b_id": detection_id, "b_seconds": seconds} for detection_id, seconds, _ in durations]
+            )
+
+
+# Shared writer used by the alert pipeline
+detection_writer = DetectionWriter(config.DETECTION_WRITE_BATCH_SIZE, config.DETECTION_WRITE_FLUSH_MS / 1000)
@@ -1,44 +1,98 @@
 import cv2
 import threading
 import time
+import numpy as np
+import requests
+from app.utils.mjpeg_parser import MJPEGParser, parse_boundary, read_jpeg_size
+
+# OpenCV decode flags per reduction factor (libjpeg scales in the DCT domain, so smaller is cheaper)
+_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+# Largest reduction factor that still keeps the image's long side at or above target_size.
+# With VGA camera frames and the default 640 model size this is always 1 (full decode).
+def reduction_factor(jpeg: bytes, target_size: int = None) -> int:
+    if not target_size:
+        return 1
+    size = read_jpeg_size(jpeg)
+    if size is None:
+        return 1
+    long_side = max(size)
+    for factor in (8, 4, 2):
+        if long_side // factor >= target_size:
+            return factor
+    return 1
+
 
 class ESP32StreamBuffer:
-    def __init__(self, stream_url):
+    def __init__(self, stream_url, connect_timeout=5, read_timeout=10):
         self.stream_url = stream_url  # URL to the ESP32-CAM stream
-        self.frame = None  # Last successfully read frame
         self.running = False  # Indicates whether the reading loop is active
-        self._lock = threading.Lock()  # Lock to ensure thread-safe access to the frame
+        self.frame_id = 0  # Sequence number of the latest frame (0 = no frame yet)
+        self.timeout = (connect_timeout, read_timeout)  # HTTP timeouts in seconds
+        self._jpeg = None  # Raw JPEG bytes of the latest frame (None = no valid frame)
+        self._decoded = {}  # (frame_id, reduction factor) -> decoded frame, for the latest frame only
+        self._generation = 0  # Incremented on every start so a stale reader thread exits on its own
+        self._listeners = []  # Callbacks notified from the reader thread on every new frame
+        self._lock = threading.Lock()  # Lock to ensure thread-safe access to the latest frame
 
     def start(self):
         """Starts the background thread that reads frames from the stream."""
         if self.running:
             return
         self.running = True
-        threading.Thread(target=self._read_loop, daemon=True).start()
+        self._generation += 1
+        threading.Thread(target=self._read_loop, args=(self._generation,), daemon=True).start()
 
-    def _read_loop(self):
-        """Continuously reads frames from the ESP32 stream into memory."""
-        cap = cv2.VideoCapture(self.stream_url)
+    def _read_loop(self, generation):
+        """Continuously reads raw JPEG frames from the ESP32 MJPEG stream into memory."""
         print(self.stream_url)
-        if not cap.isOpened():
-            print(f"[ERROR] Failed to open stream: {self.stream_url}")
-            self.running = False
+        try:
+            response = requests.get(self.stream_url, stream=True, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"[ERROR] Failed to open stream: {self.stream_url} ({e})")
+            if self._generation == generation:
+                self.running = False
             return
 
-        while self.running:
-            ret, frame = cap.read()
-            if ret:
-                # Update the latest frame with a lock for thread safety
-                with self._lock:
-                    self.frame = frame
-            else:
-                print("[WARNING] Failed to read frame, retrying in 0.5s")
-                with self._lock:
-                    self.frame = None
-                time.sleep(0.5)
-
-        # Clean up when stopping
-        cap.release()
+        parser = MJPEGParser(parse_boundary(response.headers.get("Content-Type")))
+        try:
+            while self.running and self._generation == generation:
+                try:
+                    chunk = response.raw.read1(64 * 1024)
+                except Exception as e:
+                    chunk = None
+                    print(f"[WARNING] Failed to read frame ({e})")
+
+                if not chunk:
+                    # Stream ended or timed out: drop the stale frame and let the caller reconnect
+                    if self._generation == generation:
+                        with self._lock:
+                            self._jpeg = None
+                        self.running = False
+                    break
+
+                images = parser.feed(chunk)
+                if images:
+                    # Keep only the newest image; older ones in the same chunk are already stale
+                    with self._lock:
+                        self._jpeg = images[-1]
+                        self.frame_id += 1
+                        jpeg, frame_id, listeners = self._jpeg, self.frame_id, list(self._listeners)
+                    for listener in listeners:
+                        try:
+                            listener(jpeg, frame_id)
+                        except Exception as e:
+                            print(f"[WARNING] Stream listener failed: {e}")
+        finally:
+            # Clean up when stopping
+            response.close()
 
     def stop(self):
         """Stops the reading loop."""
@@ -50,7 +104,87 @@ class ESP32StreamBuffer:
         time.sleep(1)
         self.start()
 
-    def get_latest_frame(self):
-        """Returns the most recent frame (thread-safe copy)."""
+    def add_listener(self, callback):
+        """Registers callback(jpeg, frame_id), called from the reader thread for every new frame."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def get_latest_jpeg(self):
+        """Returns (jpeg_bytes, frame_id) for the most recent frame, or (None, frame_id)."""
+        with self._lock:
+            return self._jpeg, self.frame_id
+
+    def get_latest_frame(self, target_size: int = None):
+        """
+        Returns (frame, frame_id) for the most recent frame, decoding it on first request.
+
+        See decode() for target_size. Returns (None, frame_id) when no valid frame is available.
+        """
+        jpeg, frame_id = self.get_latest_jpeg()
+        if jpeg is None:
+            return None, frame_id
+        frame, _ = self.decode(jpeg, frame_id, target_size)
+        return frame, frame_id
+
+    def decode(self, jpeg: bytes, frame_id: int, target_size: int = None):
+        """
+        Decodes a JPEG from this stream and returns (frame, factor).
+
+        With target_size the image is decoded directly at a reduced scale (1/2, 1/4 or 1/8)
+        as long as its long side stays at or above target_size; factor is that reduction,
+        so multiply coordinates found on the frame by it to map them to full resolution.
+        The frame is a read-only array shared by every caller decoding the same frame_id
+        at the same scale; copy it before drawing on it. frame is None if decoding failed.
+        """
+        factor = reduction_factor(jpeg, target_size)
+        key = (frame_id, factor)
+        with self._lock:
+            frame = self._decoded.get(key)
+        if frame is not None:
+            return frame, factor
+
+        frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), _DECODE_FLAGS[factor])
+        if frame is None:
+            return None, factor
+        frame.flags.writeable = False
+
+        # Only the newest frame is worth caching; older ids are not requested again
         with self._lock:
-            return self.frame.copy() if self.frame is not None else None
+            if frame_id == self.frame_id:
+                if any(cached_id != frame_id for cached_id, _ in self._decoded):
+                    self._decoded.clear()
+                self._decoded[key] = frame
+        return frame, factor
+
+
+# Shared stream buffers, so every consumer of a camera (detection loop, relay viewers) uses one connection
+stream_buffers = {}  # key: profile_id_camera_type, value: ESP32StreamBuffer
+_stream_buffer_users = {}  # key: profile_id_camera_type, value: number of active users
+
+
+# Get the shared buffer for a camera, creating and starting it on first use
+def acquire_stream_buffer(key: str, stream_url: str) -> ESP32StreamBuffer:
+    stream_buffer = stream_buffers.get(key)
+    if stream_buffer is None:
+        stream_buffer = ESP32StreamBuffer(stream_url)
+        stream_buffer.start()
+        stream_buffers[key] = stream_buffer
+    _stream_buffer_users[key] = _stream_buffer_users.get(key, 0) + 1
+    return stream_buffer
+
+
+# Release a buffer obtained from acquire_stream_buffer(); the connection closes with its last user
+def release_stream_buffer(key: str):
+    users = _stream_buffer_users.get(key, 0) - 1
+    if users > 0:
+        _stream_buffer_users[key] = users
+        return
+    _stream_buffer_users.pop(key, None)
+    stream_buffer = stream_buffers.pop(key, None)
+    if stream_buffer:
+        stream_buffer.stop()
@@ -9,11 +9,13 @@ def send_push_notifications(
     tokens: list[str],
     base_message_json: dict,
     project_id: str,
-    credentials_path: str
+    credentials_path: str,
+    session_factory=SessionLocal
 ):
     """
     Sends push notifications to multiple devices using Firebase Cloud Messaging (HTTP v1 API).
     Expects a base_message_json (without the 'token') which is added per device before sending.
+    Invalid tokens are removed with a session from session_factory (the detection pool for detection callers).
     """
     # Load service account credentials and generate access token
     credentials = service_account.Credentials.from_service_account_file(
@@ -60,7 +62,7 @@ def send_push_notifications(
                         # Remove invalid or unregistered tokens from DB
                         if 'requested entity was not found' in error_message or 'notregistered' in error_message:
                             print("[FCM REMOVE] Invalid token detected:", token)
-                            _delete_token_from_db(token)
+                            _delete_token_from_db(token, session_factory)
 
                         elif 'invalid argument' in error_message:
                             print("[FCM ERROR] Invalid message format - check payload structure")
@@ -82,17 +84,17 @@ def send_push_notifications(
                     error_message = error_json.get('error', {}).get('message', '').lower()
                     if 'requested entity was not found' in error_message or 'notregistered' in error_message:
                         print("[FCM REMOVE] Invalid token detected (from exception):", token)
-                        _delete_token_from_db(token)
+                        _delete_token_from_db(token, session_factory)
                 except Exception as parse_err:
                     print(f"[FCM ERROR] Failed to parse exception response: {parse_err}")
 
 
-def _delete_token_from_db(token: str):
+def _delete_token_from_db(token: str, session_factory=SessionLocal):
     """
     Removes an invalid or expired FCM token from the database.
     """
+    db = session_factory()
     try:
-        db = SessionLocal()
         token_obj = db.query(UserFCMToken).filter_by(token=token).first()
         if token_obj:
             db.delete(token_obj)
@@ -0,0 +1,72 @@
+import os
+import queue
+import threading
+
+
+class FileReaper:
+    """
+    Deletes files on a background thread, so requests that remove many records
+    (and their images) return as soon as the database work is committed.
+
+    Paths are queued with delete(); missing files are counted but not reported as
+    errors, since a file may already be gone by the time the worker reaches it.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()  # Guards the lazy start of the worker thread
+
+        # Counters exposed for monitoring
+        self.removed = 0
+        self.missing = 0
+        self.failed = 0
+
+    def delete(self, paths):
+        """Queues files for deletion and returns immediately."""
+        paths = [path for path in paths if path]
+        if not paths:
+            return
+        self._start()
+        self._queue.put(paths)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Blocks until every queued file was handled (or timeout); returns False on timeout."""
+        done = threading.Event()
+        self._start()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "pending_batches": self._queue.qsize(),
+            "removed": self.removed,
+            "missing": self.missing,
+            "failed": self.failed,
+        }
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            for path in item:
+                try:
+                    os.remove(path)
+                    self.removed += 1
+                except FileNotFoundError:
+                    self.missing += 1
+                except OSError as e:
+                    self.failed += 1
+                    print(f"[WARNING] Failed to delete file {path}: {e}")
+
+
+# Shared reaper for detection images and other uploaded files
+file_reaper = FileReaper()
@@ -0,0 +1,31 @@
+from app.utils.config import config
+
+
+class AdaptiveFrameSampler:
+    """
+    Decides how long a detection loop waits before analysing the next frame.
+
+    Active scenes (recent detections or motion) are sampled at the minimum interval.
+    Static scenes back off gradually towards the maximum interval. When the shared
+    inference workers run above the CPU budget, every camera stretches its interval
+    proportionally so the total load settles back under the budget.
+    """
+
+    def __init__(self, min_interval: float = None, max_interval: float = None, cpu_budget: float = None, backoff: float = 1.5):
+        self.min_interval = min_interval if min_interval is not None else config.SAMPLER_MIN_INTERVAL
+        self.max_interval = max_interval if max_interval is not None else config.SAMPLER_MAX_INTERVAL
+        self.cpu_budget = cpu_budget if cpu_budget is not None else config.INFERENCE_CPU_BUDGET
+        self.backoff = backoff  # Growth factor applied per static frame
+        self.interval = self.min_interval  # Activity-based interval, before load adjustment
+
+    def next_interval(self, active: bool, utilization: float) -> float:
+        """Returns the delay before the next frame given scene activity and inference utilization."""
+        if active:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+        # Scale up under load; allow going past max_interval so the budget is actually respected
+        if self.cpu_budget > 0 and utilization > self.cpu_budget:
+            return self.interval * (utilization / self.cpu_budget)
+        return self.interval
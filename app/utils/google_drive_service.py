@@ -123,9 +123,10 @@ class GoogleDriveService:
 
         raise Exception(f"Download failed after {max_retries} retries")
 
-    def delete_baby_profile_folder(self, baby_profile_id: int, root_folder_name="babycam_data", max_retries=5):
+    def delete_baby_profile_folder(self, baby_profile_id: int, root_folder_name="babycam_data", max_retries=5, raise_on_failure=False):
         """
         Deletes the folder for a specific baby_profile_id from the babycam_data root folder in Drive.
+        With raise_on_failure, errors are raised instead of returning False (a missing folder still returns False).
         """
         try:
             # Step 1: Locate the root folder ID
@@ -159,4 +160,6 @@ class GoogleDriveService:
 
         except Exception as e:
             print(f"[DELETE FOLDER FAILED] {e}")
+            if raise_on_failure:
+                raise
             return False
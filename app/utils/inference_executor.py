@@ -0,0 +1,199 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from app.utils.config import config
+
+# Plain NumPy view of a YOLO result: boxes (N, 4), confidences (N,), class indexes (N,)
+Detections = namedtuple("Detections", ["xyxy", "conf", "cls"])
+
+
+# A frame waiting for a free inference worker
+class _Job:
+    def __init__(self, model_key, model, frame, future):
+        self.model_key = model_key
+        self.model = model
+        self.frame = frame
+        self.future = future
+
+
+class InferenceExecutor:
+    """
+    Runs YOLO inference on a pool of worker threads or processes so the event loop
+    never blocks on a forward pass.
+
+    Each camera has a pending slot of depth 1: if a camera submits a new frame while
+    its previous one is still waiting for a worker, the old frame is dropped and its
+    caller receives None.
+
+    Frames are not batched across cameras: every camera runs its own trained model
+    file (uploads/training_data/<profile>/<camera>/...), so no two cameras ever share
+    a model to batch on.
+
+    Process workers are spawned, not forked: the API process already runs torch and
+    the stream reader threads, and forking it can deadlock the child. Each worker
+    imports the model stack at start-up and loads a model the first time one of its
+    frames arrives; the API process keeps no copy of its own.
+    """
+
+    def __init__(self, workers: int, mode: str = "thread", load_window: float = 10.0):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported inference mode: {mode}")
+        self.workers = max(1, workers)
+        self.mode = mode
+        self._pool = None  # Created lazily on first use
+        self._pending = OrderedDict()  # camera_key -> _Job, oldest first
+        self._busy = 0  # Number of workers currently running a job
+        self._cameras = {}  # model_key -> set of attached camera keys
+        self._model_locks = {}  # model_key -> Lock (YOLO instances are not thread-safe)
+        self._load_window = load_window  # Seconds of history used to compute utilization
+        self._busy_periods = deque()  # (finished_at, duration) of recent jobs
+
+        # Counters exposed for monitoring
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+
+    def attach(self, camera_key: str, model_key):
+        """Registers a camera as a user of a model (its lock is kept while any camera uses it)."""
+        self._cameras.setdefault(model_key, set()).add(camera_key)
+
+    def detach(self, camera_key: str, model_key):
+        cameras = self._cameras.get(model_key)
+        if cameras is not None:
+            cameras.discard(camera_key)
+            if not cameras:
+                del self._cameras[model_key]
+                self._model_locks.pop(model_key, None)
+
+    async def infer(self, camera_key: str, model_key, model, frame):
+        """Queues a frame for inference and returns its Detections (or None if it was dropped)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        stale = self._pending.pop(camera_key, None)
+        if stale is not None and not stale.future.done():
+            stale.future.set_result(None)
+            self.dropped += 1
+
+        self._pending[camera_key] = _Job(model_key, model, frame, future)
+        self.submitted += 1
+        self._dispatch(loop)
+        return await future
+
+    def utilization(self) -> float:
+        """Fraction of total worker capacity spent on inference over the recent window (0.0 - 1.0)."""
+        now = time.monotonic()
+        while self._busy_periods and self._busy_periods[0][0] < now - self._load_window:
+            self._busy_periods.popleft()
+        busy = sum(duration for _, duration in self._busy_periods)
+        return min(1.0, busy / (self._load_window * self.workers))
+
+    def stats(self):
+        """Returns a snapshot of the executor state for monitoring."""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            "utilization": round(self.utilization(), 3),
+            "pending_frames": len(self._pending),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker_process
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        return self._pool
+
+    def _dispatch(self, loop):
+        # Hand pending frames to free workers (always runs on the event loop thread)
+        while self._pending and self._busy < self.workers:
+            _, job = self._pending.popitem(last=False)
+            if job.future.done():
+                continue  # Caller was cancelled while waiting
+
+            if self.mode == "process":
+                call = partial(_infer_in_process, job.model_key, job.frame, config.INFERENCE_IMAGE_SIZE)
+            else:
+                lock = self._model_locks.setdefault(job.model_key, threading.Lock())
+                call = partial(_infer_in_thread, job.model, lock, job.frame, config.INFERENCE_IMAGE_SIZE)
+
+            self._busy += 1
+            worker_future = loop.run_in_executor(self._get_pool(), call)
+            worker_future.add_done_callback(partial(self._on_done, loop, job, time.monotonic()))
+
+    def _on_done(self, loop, job, started_at, worker_future):
+        finished_at = time.monotonic()
+        self._busy_periods.append((finished_at, finished_at - started_at))
+        self._busy -= 1
+        self.completed += 1
+        if not job.future.done():
+            if worker_future.cancelled():
+                job.future.set_result(None)
+            elif worker_future.exception() is not None:
+                job.future.set_exception(worker_future.exception())
+            else:
+                job.future.set_result(worker_future.result())
+        self._dispatch(loop)
+
+
+# Convert an ultralytics result into plain NumPy arrays
+def _to_detections(result) -> Detections:
+    boxes = result.boxes
+    return Detections(
+        boxes.xyxy.cpu().numpy(),
+        boxes.conf.cpu().numpy(),
+        boxes.cls.cpu().numpy().astype(np.int64),
+    )
+
+
+# Thread worker: runs the shared model instance, one call at a time per model
+def _infer_in_thread(model, lock, frame, imgsz):
+    with lock:
+        result = model(frame, imgsz=imgsz, verbose=False)[0]
+    return _to_detections(result)
+
+
+# Per-process model cache used when running in process mode
+_process_models = {}
+
+
+# Process worker start-up: import torch/ultralytics now rather than on the first frame
+def _init_worker_process():
+    import ultralytics  # noqa: F401
+
+
+# Process worker: loads each model version once per worker process and runs it
+def _infer_in_process(model_key, frame, imgsz):
+    model = _process_models.get(model_key)
+    if model is None:
+        from ultralytics import YOLO
+        # Forget older versions of the same model file
+        for key in [k for k in _process_models if k[0] == model_key[0]]:
+            del _process_models[key]
+        model = YOLO(model_key[0])
+        _process_models[model_key] = model
+    result = model(frame, imgsz=imgsz, verbose=False)[0]
+    return _to_detections(result)
+
+
+# Shared executor used by all detection loops
+inference_executor = InferenceExecutor(config.INFERENCE_WORKERS, config.INFERENCE_MODE)
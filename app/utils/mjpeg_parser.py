@@ -0,0 +1,93 @@
+import re
+
+# JPEG start-of-image marker
+_JPEG_SOI = b"\xff\xd8"
+_CONTENT_LENGTH = re.compile(rb"content-length:\s*(\d+)", re.IGNORECASE)
+
+
+# Extract the multipart boundary from a Content-Type header value
+def parse_boundary(content_type: str):
+    match = re.search(r"boundary=\"?([^\";]+)\"?", content_type or "")
+    return match.group(1).strip().lstrip("-").encode() if match else None
+
+
+class MJPEGParser:
+    """
+    Incremental parser for multipart/x-mixed-replace MJPEG streams.
+
+    Feed raw bytes as they arrive from the socket; complete JPEG images are returned
+    as bytes without being decoded. Parts are cut using their Content-Length header
+    when present (as sent by the ESP32 firmware), otherwise at the next boundary.
+    """
+
+    def __init__(self, boundary: bytes = None, max_buffer_bytes: int = 4 * 1024 * 1024):
+        self._delimiter = b"--" + boundary if boundary else None
+        self._buffer = bytearray()
+        self.max_buffer_bytes = max_buffer_bytes  # Drop data and resync if a part never completes
+
+    def feed(self, data: bytes):
+        """Adds received bytes and returns the list of complete JPEG images found."""
+        self._buffer += data
+        images = []
+        while True:
+            image = self._next_part()
+            if image is None:
+                break
+            if image.startswith(_JPEG_SOI):
+                images.append(image)
+
+        if len(self._buffer) > self.max_buffer_bytes:
+            print("[WARNING] MJPEG buffer overflow, resynchronizing stream")
+            self._buffer.clear()
+        return images
+
+    def _next_part(self):
+        buffer = self._buffer
+        header_end = buffer.find(b"\r\n\r\n")
+        if header_end < 0:
+            return None
+
+        body_start = header_end + 4
+        length_match = _CONTENT_LENGTH.search(buffer, 0, header_end)
+        if length_match:
+            body_end = body_start + int(length_match.group(1))
+            if len(buffer) < body_end:
+                return None
+            image = bytes(buffer[body_start:body_end])
+            del buffer[:body_end]
+            return image
+
+        if self._delimiter is None:
+            # Without a length or a boundary there is no way to find the end of the part
+            del buffer[:body_start]
+            return b""
+
+        body_end = buffer.find(self._delimiter, body_start)
+        if body_end < 0:
+            return None
+        image = bytes(buffer[body_start:body_end]).rstrip(b"\r\n")
+        del buffer[:body_end]
+        return image
+
+
+# Read (width, height) from a JPEG's frame header without decoding it
+def read_jpeg_size(data: bytes):
+    index = 2  # Skip the SOI marker
+    while index + 9 < len(data):
+        if data[index] != 0xFF:
+            index += 1
+            continue
+        marker = data[index + 1]
+        if marker == 0xFF:
+            index += 1  # Fill byte
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            index += 2  # Marker without a payload
+            continue
+        # SOF0-SOF15 (excluding DHT, JPG and DAC) carry the image size
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[index + 5:index + 7], "big")
+            width = int.from_bytes(data[index + 7:index + 9], "big")
+            return width, height
+        index += 2 + int.from_bytes(data[index + 2:index + 4], "big")
+    return None
@@ -0,0 +1,146 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from ultralytics import YOLO
+from app.utils.config import config
+
+
+# A single loaded model together with its bookkeeping data
+class _ModelEntry:
+    def __init__(self, key, model, size_bytes):
+        self.key = key  # (absolute model path, file mtime)
+        self.model = model  # Shared, warmed-up YOLO instance
+        self.size_bytes = size_bytes  # Estimated memory footprint of the weights
+        self.ref_count = 0  # Number of detection loops currently using this model
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of YOLO models shared by all detection loops.
+
+    Models are keyed by (absolute path, file mtime), so a retrained model file is
+    picked up automatically on the next acquire while loops still running on the
+    previous weights keep their instance until they release it.
+    Unreferenced models are evicted in LRU order once the memory budget is exceeded.
+
+    Every camera has its own trained model file, so two running cameras never share
+    an instance; the cache pays off when a camera's loop restarts (reconnects,
+    monitoring toggled off and on) and finds its model still warm.
+
+    With load_models=False (process inference mode) only the versioned keys and
+    reference counts are kept: the worker processes load their own copies, so
+    loading one here as well would just double the memory per camera.
+    """
+
+    def __init__(self, max_bytes: int, load_models: bool = True):
+        self.max_bytes = max_bytes
+        self.load_models = load_models
+        self._entries = OrderedDict()  # key -> _ModelEntry, least recently used first
+        self._lock = threading.Lock()
+        self._loading = {}  # key -> Event set once a load in progress finishes (or fails)
+
+    def acquire(self, model_path: str):
+        """Returns (key, model) for the given path, loading and warming it up if needed (model is None without load_models)."""
+        abs_path = os.path.abspath(model_path)
+        key = (abs_path, os.path.getmtime(abs_path))
+        loaded = False
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if not loaded:
+                        print(f"[MODEL REGISTRY] Reusing cached model {abs_path}")
+                    entry.ref_count += 1
+                    self._entries.move_to_end(key)
+                    self._evict_if_needed()
+                    return key, entry.model
+
+                # Only one caller loads a given version; the others wait for it
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+
+            if not owner:
+                loading.wait()
+                continue
+
+            # Load outside the lock so cache hits for other models are not held up by a slow load
+            try:
+                entry = self._load(key)
+            except Exception:
+                with self._lock:
+                    self._loading.pop(key).set()
+                raise
+            with self._lock:
+                self._entries[key] = entry
+                self._drop_stale_versions(abs_path, key)
+                self._loading.pop(key).set()
+            loaded = True
+
+    def release(self, key):
+        """Releases a model previously returned by acquire()."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.ref_count = max(0, entry.ref_count - 1)
+            self._evict_if_needed()
+
+    def stats(self):
+        """Returns a snapshot of the cached models for monitoring."""
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "total_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "models": [
+                    {"path": e.key[0], "mtime": e.key[1], "size_bytes": e.size_bytes, "ref_count": e.ref_count}
+                    for e in self._entries.values()
+                ],
+            }
+
+    def _load(self, key):
+        abs_path = key[0]
+        if not self.load_models:
+            return _ModelEntry(key, None, os.path.getsize(abs_path))
+        print(f"[MODEL REGISTRY] Loading model {abs_path}")
+        model = YOLO(abs_path)
+
+        # Run a dummy inference so the first real frame doesn't pay the setup cost
+        model(np.zeros((config.INFERENCE_IMAGE_SIZE, config.INFERENCE_IMAGE_SIZE, 3), dtype=np.uint8), verbose=False)
+
+        return _ModelEntry(key, model, _estimate_model_bytes(model, abs_path))
+
+    def _drop_stale_versions(self, abs_path, current_key):
+        # Older versions of the same file are useless once nobody holds them
+        for key in list(self._entries.keys()):
+            if key[0] == abs_path and key != current_key and self._entries[key].ref_count == 0:
+                print(f"[MODEL REGISTRY] Dropping stale model version {abs_path}")
+                del self._entries[key]
+
+    def _evict_if_needed(self):
+        total = sum(e.size_bytes for e in self._entries.values())
+        for key in list(self._entries.keys()):
+            if total <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if entry.ref_count == 0:
+                print(f"[MODEL REGISTRY] Evicting model {key[0]}")
+                total -= entry.size_bytes
+                del self._entries[key]
+
+
+# Estimate the in-memory size of a model from its parameters (falls back to file size)
+def _estimate_model_bytes(model, path: str) -> int:
+    try:
+        return sum(p.numel() * p.element_size() for p in model.model.parameters())
+    except Exception:
+        return os.path.getsize(path)
+
+
+# Shared registry instance used by all detection loops
+model_registry = ModelRegistry(config.MODEL_CACHE_MAX_MB * 1024 * 1024, load_models=config.INFERENCE_MODE != "process")
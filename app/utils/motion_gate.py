@@ -0,0 +1,45 @@
+import time
+import cv2
+import numpy as np
+from app.utils.config import config
+
+
+class MotionGate:
+    """
+    Cheap scene-change check run before YOLO.
+
+    Each frame is reduced to a tiny grayscale thumbnail and compared with the thumbnail
+    of the last analysed frame. If the mean absolute difference is below the threshold
+    the frame is skipped. The reference only moves forward when a frame is analysed, so
+    slow changes still add up until they cross the threshold. A frame is analysed anyway
+    after max_skip_seconds, so lighting drift can't hide an object forever.
+    """
+
+    def __init__(self, threshold: float = None, max_skip_seconds: float = None, size=(64, 48)):
+        self.threshold = threshold if threshold is not None else config.MOTION_GATE_THRESHOLD
+        self.max_skip_seconds = max_skip_seconds if max_skip_seconds is not None else config.MOTION_GATE_MAX_SKIP_SECONDS
+        self.size = size  # Thumbnail (width, height) used for the comparison
+        self.last_change = 0.0  # Change score of the most recent frame (0-255 scale)
+        self._reference = None  # Thumbnail of the last analysed frame
+        self._reference_time = 0.0
+
+    def should_analyse(self, frame) -> bool:
+        """Returns True if the frame differs enough from the last analysed one to run the model."""
+        thumbnail = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), self.size, interpolation=cv2.INTER_AREA)
+        now = time.monotonic()
+
+        if self._reference is not None:
+            self.last_change = self._change(thumbnail)
+            if self.last_change < self.threshold and now - self._reference_time < self.max_skip_seconds:
+                return False
+
+        self._reference = thumbnail
+        self._reference_time = now
+        return True
+
+    @property
+    def motion_detected(self) -> bool:
+        return self.threshold > 0 and self.last_change >= self.threshold
+
+    def _change(self, thumbnail) -> float:
+        return float(np.mean(cv2.absdiff(thumbnail, self._reference)))
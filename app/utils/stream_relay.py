@@ -0,0 +1,173 @@
+import asyncio
+import time
+from collections import namedtuple
+import cv2
+from app.utils.esp32_stream_buffer import acquire_stream_buffer, release_stream_buffer
+
+# Multipart boundary used for relayed MJPEG responses
+MJPEG_BOUNDARY = "babycamframe"
+
+# Downscaled live preview settings: max width (pixels), JPEG quality (0-100) and max frames per second
+PreviewVariant = namedtuple("PreviewVariant", ["width", "quality", "max_fps"])
+
+# Available preview variants; "full" relays the camera's own JPEGs untouched
+PREVIEW_VARIANTS = {
+    "full": None,
+    "medium": PreviewVariant(width=320, quality=70, max_fps=12),
+    "low": PreviewVariant(width=160, quality=50, max_fps=5),
+}
+
+
+class StreamRelay:
+    """
+    Fans the frames of one camera out to any number of live viewers over a single
+    camera connection.
+
+    Every viewer has a queue of depth 1: when a viewer is slower than the camera the
+    frame it hasn't picked up yet is replaced by the newest one, so slow clients skip
+    frames instead of building up latency or slowing down other viewers.
+
+    With a preview variant the relay downscales and re-encodes frames (at most
+    max_fps, on a worker thread) once for all viewers of that variant. While an
+    encode is running, newer camera frames are skipped rather than queued.
+    """
+
+    def __init__(self, key: str, stream_buffer, loop, variant: PreviewVariant = None):
+        self.key = key
+        self.stream_buffer = stream_buffer
+        self.variant = variant
+        self.viewers = set()  # One asyncio.Queue(maxsize=1) per connected viewer
+        self.frames_dropped = 0  # Frames replaced before a slow viewer could send them
+        self.frames_encoded = 0  # Preview frames produced (variants only)
+        self._latest = None  # (jpeg, frame_id) last published, sent first to new viewers
+        self._encoding = False  # A preview encode is running on a worker thread
+        self._last_encode = 0.0
+        self._loop = loop
+        stream_buffer.add_listener(self._on_frame)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=1)
+        if self._latest is None and self.variant is None:
+            jpeg, frame_id = self.stream_buffer.get_latest_jpeg()
+            if jpeg is not None:
+                self._latest = (jpeg, frame_id)
+        if self._latest is not None:
+            queue.put_nowait(self._latest)  # Show something right away
+        self.viewers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.viewers.discard(queue)
+
+    def ensure_running(self):
+        """Reconnects to the camera if its stream dropped while only viewers were using it."""
+        if not self.stream_buffer.running:
+            self.stream_buffer.start()
+
+    def close(self):
+        self.stream_buffer.remove_listener(self._on_frame)
+
+    def stats(self) -> dict:
+        stats = {"viewers": len(self.viewers), "frames_dropped": self.frames_dropped}
+        if self.variant is not None:
+            stats["frames_encoded"] = self.frames_encoded
+        return stats
+
+    def _on_frame(self, jpeg, frame_id):
+        # Called from the stream reader thread
+        if self.variant is None:
+            self._loop.call_soon_threadsafe(self._publish, jpeg, frame_id)
+        else:
+            self._loop.call_soon_threadsafe(self._schedule_encode, jpeg, frame_id)
+
+    def _schedule_encode(self, jpeg, frame_id):
+        now = time.monotonic()
+        if self._encoding or now - self._last_encode < 1.0 / self.variant.max_fps:
+            return
+        self._encoding = True
+        self._last_encode = now
+        future = self._loop.run_in_executor(None, self._encode, jpeg, frame_id)
+        future.add_done_callback(lambda f: self._on_encoded(f, frame_id))
+
+    def _encode(self, jpeg, frame_id):
+        # Decode at the smallest JPEG scale that still covers the variant width, then resize and encode
+        frame, _ = self.stream_buffer.decode(jpeg, frame_id, self.variant.width)
+        if frame is None:
+            return None
+        height, width = frame.shape[:2]
+        if width > self.variant.width:
+            size = (self.variant.width, max(1, round(height * self.variant.width / width)))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.variant.quality])
+        return encoded.tobytes() if ok else None
+
+    def _on_encoded(self, future, frame_id):
+        self._encoding = False
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            print(f"[WARNING] Preview encode failed for {self.key}: {future.exception()}")
+            return
+        if future.result() is not None:
+            self.frames_encoded += 1
+            self._publish(future.result(), frame_id)
+
+    def _publish(self, jpeg, frame_id):
+        self._latest = (jpeg, frame_id)
+        for queue in self.viewers:
+            if queue.full():
+                queue.get_nowait()
+                self.frames_dropped += 1
+            queue.put_nowait((jpeg, frame_id))
+
+
+# Active relays, one per camera and preview variant with at least one viewer
+stream_relays = {}  # key: (profile_id_camera_type, variant name), value: StreamRelay
+
+
+# Register a new viewer for a camera and return (relay, viewer queue)
+def open_viewer(key: str, stream_url: str, variant: str = "full"):
+    relay = stream_relays.get((key, variant))
+    if relay is None:
+        stream_buffer = acquire_stream_buffer(key, stream_url)
+        relay = StreamRelay(key, stream_buffer, asyncio.get_running_loop(), PREVIEW_VARIANTS[variant])
+        stream_relays[(key, variant)] = relay
+    relay.ensure_running()
+    return relay, relay.subscribe()
+
+
+# Unregister a viewer; the relay (and its hold on the camera stream) goes away with the last one
+def close_viewer(key: str, queue: asyncio.Queue, variant: str = "full"):
+    relay = stream_relays.get((key, variant))
+    if relay is None:
+        return
+    relay.unsubscribe(queue)
+    if not relay.viewers:
+        relay.close()
+        del stream_relays[(key, variant)]
+        release_stream_buffer(key)
+
+
+# Yields the latest JPEG frames for one viewer until the caller stops iterating
+async def iter_viewer_frames(key: str, stream_url: str, variant: str = "full", idle_timeout: float = 5.0):
+    relay, queue = open_viewer(key, stream_url, variant)
+    try:
+        while True:
+            try:
+                jpeg, _ = await asyncio.wait_for(queue.get(), timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                relay.ensure_running()
+                continue
+            yield jpeg
+    finally:
+        close_viewer(key, queue, variant)
+
+
+# Wraps viewer frames as a multipart/x-mixed-replace body for plain HTTP clients
+async def mjpeg_response_body(key: str, stream_url: str, variant: str = "full"):
+    async for jpeg in iter_viewer_frames(key, stream_url, variant):
+        yield (
+            f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+            + jpeg
+            + b"\r\n"
+        )
@@ -0,0 +1,161 @@
+import itertools
+from collections import deque
+import numpy as np
+
+_track_ids = itertools.count(1)
+
+
+# Pairwise IoU between boxes a (N, 4) and b (M, 4) in xyxy format
+def iou_matrix(a, b):
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0)
+
+
+class Track:
+    """One object followed across analysed frames."""
+
+    def __init__(self, cls: int, xyxy, conf: float, now: float, history: int, ema: float):
+        self.id = next(_track_ids)
+        self.cls = cls
+        self.xyxy = xyxy
+        self.conf = conf  # Confidence in the latest matched frame
+        self.ema = ema  # Exponentially smoothed confidence, starting from 0 (misses count as 0)
+        self.hits = deque([True], maxlen=history)  # Matched or not, for the last analysed frames
+        self.first_seen = now
+        self.last_seen = now
+        self.missed = 0  # Consecutive analysed frames without a match
+        self.alerts = []  # Alerts raised for this track (first appearance, then escalations)
+        self.alerted_conf = 0.0  # Confidence at the last alert
+
+    @property
+    def duration(self) -> float:
+        return self.last_seen - self.first_seen
+
+
+class IoUTracker:
+    """
+    Greedy IoU tracker: each new box is matched to the overlapping track of the same
+    class with the highest IoU. Unmatched boxes start new tracks; tracks unmatched
+    for more than max_missed analysed frames end and are moved to `ended`.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_missed: int = 5, history: int = 5, ema_alpha: float = 0.5):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.history = history
+        self.ema_alpha = ema_alpha
+        self.tracks = []
+        self.ended = []  # Tracks that ended since the caller last cleared this list
+
+    def update(self, xyxy, conf, cls, now: float):
+        """Matches this frame's boxes to tracks and returns the track of each box, in box order."""
+        matched = [None] * len(conf)
+        unmatched_tracks = set(range(len(self.tracks)))
+
+        if self.tracks and len(conf):
+            ious = iou_matrix(np.asarray(xyxy, dtype=float), np.array([t.xyxy for t in self.tracks], dtype=float))
+            ious[np.asarray(cls)[:, None] != np.array([t.cls for t in self.tracks])[None, :]] = -1.0
+            while True:
+                box, track = np.unravel_index(np.argmax(ious), ious.shape)
+                if ious[box, track] < self.iou_threshold:
+                    break
+                matched[box] = self.tracks[track]
+                unmatched_tracks.discard(track)
+                ious[box, :] = -1.0
+                ious[:, track] = -1.0
+
+        for index, track in enumerate(matched):
+            if track is None:
+                track = Track(int(cls[index]), xyxy[index], float(conf[index]), now, self.history, self.ema_alpha * float(conf[index]))
+                self.tracks.append(track)
+                matched[index] = track
+            else:
+                track.xyxy = xyxy[index]
+                track.conf = float(conf[index])
+                track.ema = self.ema_alpha * track.conf + (1 - self.ema_alpha) * track.ema
+                track.hits.append(True)
+                track.last_seen = now
+                track.missed = 0
+
+        for index in unmatched_tracks:
+            track = self.tracks[index]
+            track.ema *= 1 - self.ema_alpha
+            track.hits.append(False)
+            track.missed += 1
+
+        alive = []
+        for track in self.tracks:
+            (alive if track.missed <= self.max_missed else self.ended).append(track)
+        self.tracks = alive
+        return matched
+
+
+class TrackAlerts:
+    """
+    Per-camera alert policy built on the IoU tracker, so alerts follow objects rather
+    than time: each track alerts once when it appears and, if escalation_delta is set,
+    again whenever its confidence rises that much above the last alerted value. Tracks
+    that end are handed back with their alerts so the caller can record how long the
+    object stayed in view.
+
+    With a confirmation mode a track must first be confirmed: seen in at least n of
+    the last m analysed frames ('n_of_m'), or with a smoothed confidence above the
+    class threshold ('ema'). With 'off' a track can alert on its first frame.
+    """
+
+    def __init__(self, confirmation: str = "off", n: int = 3, m: int = 5, ema_alpha: float = 0.5,
+                 iou_threshold: float = 0.3, max_missed: int = 5, escalation_delta: float = 0.0):
+        if confirmation not in ("off", "n_of_m", "ema"):
+            raise ValueError(f"Unsupported confirmation mode: {confirmation}")
+        self.confirmation = confirmation
+        self.n = n
+        self.escalation_delta = escalation_delta
+        self.tracker = IoUTracker(iou_threshold, max_missed=max_missed, history=m, ema_alpha=ema_alpha)
+
+    def update(self, detections, thresholds, confident, now: float):
+        """
+        Tracks the confident boxes of a frame.
+
+        Returns (eligible, tracks): a boolean mask of boxes whose track may alert now
+        (confirmed, and new or escalated), and the track of each box (None for boxes
+        below threshold).
+        """
+        indexes = np.flatnonzero(confident)
+        tracks = [None] * len(detections.conf)
+        eligible = np.zeros(len(detections.conf), dtype=bool)
+        matched = self.tracker.update(detections.xyxy[indexes], detections.conf[indexes], detections.cls[indexes], now)
+
+        for index, track in zip(indexes, matched):
+            tracks[index] = track
+            eligible[index] = self._confirmed(track, thresholds[track.cls]) and (not track.alerts or self._escalated(track))
+        return eligible, tracks
+
+    def mark_alerted(self, track: Track, alert):
+        track.alerts.append(alert)
+        track.alerted_conf = track.conf
+
+    def pop_ended(self):
+        """Returns the tracks that ended since the last call."""
+        ended, self.tracker.ended = self.tracker.ended, []
+        return ended
+
+    def end_all(self):
+        """Ends every live track (e.g. when the loop stops) and returns all ended tracks."""
+        self.tracker.ended.extend(self.tracker.tracks)
+        self.tracker.tracks = []
+        return self.pop_ended()
+
+    def _confirmed(self, track: Track, threshold: float) -> bool:
+        if self.confirmation == "ema":
+            return track.ema > threshold
+        if self.confirmation == "n_of_m":
+            return sum(track.hits) >= self.n
+        return True
+
+    def _escalated(self, track: Track) -> bool:
+        return self.escalation_delta > 0 and track.conf >= track.alerted_conf + self.escalation_delta
@@ -0,0 +1,123 @@
+"""
+Benchmark: detection history queries on a large detection_results table.
+
+Seeds a baby profile with synthetic detections (needs a PostgreSQL database
+configured through the usual DB_* environment variables, with migrations applied),
+then compares loading the full list as /detection_results/filter does, a deep
+OFFSET page, and keyset pages from get_detection_results_page(), both for the
+profile and camera and unfiltered across all of the user's profiles. The seeded
+rows are removed afterwards.
+
+Usage:
+    python -m benchmarks.bench_detection_history --baby-profile-id 1 --class-id 3 --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+from app.models.baby_profile_model import BabyProfile
+from app.models.detection_result_model import DetectionResult
+from app.services.detection_result_service import get_detection_results_by_filters, get_detection_results_page
+from database.database import SessionLocal
+
+# class_name used to tag seeded rows so they can be removed afterwards
+BENCH_MARKER = "__bench__"
+
+
+def seed(db, profile_id, class_id, camera_type, rows):
+    db.execute(text("""
+        INSERT INTO detection_results (baby_profile_id, class_id, class_name, confidence, camera_type, timestamp, image_path)
+        SELECT :profile_id, :class_id, :marker, random(), :camera_type,
+               now() - make_interval(secs => n), 'detections/bench.jpg'
+        FROM generate_series(1, :rows) AS n
+    """), {"profile_id": profile_id, "class_id": class_id, "marker": BENCH_MARKER, "camera_type": camera_type, "rows": rows})
+    db.commit()
+    db.execute(text("ANALYZE detection_results"))
+
+
+def cleanup(db):
+    db.execute(text("DELETE FROM detection_results WHERE class_name = :marker"), {"marker": BENCH_MARKER})
+    db.commit()
+
+
+# Page at a given OFFSET, the way a page-number API would fetch it
+def offset_page(db, profile_id, camera_type, offset, limit):
+    return db.query(DetectionResult).filter(
+        DetectionResult.baby_profile_id == profile_id,
+        DetectionResult.camera_type == camera_type
+    ).order_by(DetectionResult.timestamp.desc(), DetectionResult.id.desc()).offset(offset).limit(limit).all()
+
+
+def measure(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+# Walk up to max_pages consecutive keyset pages; returns the average ms per page actually fetched
+def walk_pages(db, user_id, max_pages, **filters):
+    cursor = None
+    pages = 0
+    start = time.perf_counter()
+    while pages < max_pages:
+        page = get_detection_results_page(db, user_id, cursor=cursor, **filters)
+        pages += 1
+        cursor = page.next_cursor
+        if not page.has_more:
+            break
+    return (time.perf_counter() - start) / pages * 1000, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baby-profile-id", type=int, required=True, help="Existing baby profile to seed")
+    parser.add_argument("--class-id", type=int, required=True, help="Existing class of that profile")
+    parser.add_argument("--camera-type", default="head_camera", choices=["head_camera", "static_camera"])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--pages", type=int, default=20, help="Keyset pages to walk")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-full", action="store_true", help="Skip loading the full list (slow on big tables)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        user_id = db.query(BabyProfile.user_id).filter(BabyProfile.id == args.baby_profile_id).scalar()
+        if user_id is None:
+            sys.exit(f"Baby profile {args.baby_profile_id} not found")
+
+        print(f"Seeding {args.rows} detections...")
+        seed(db, args.baby_profile_id, args.class_id, args.camera_type, args.rows)
+
+        if not args.skip_full:
+            ms = measure(lambda: get_detection_results_by_filters(db, user_id, args.baby_profile_id, args.camera_type), 1)
+            print(f"full list (/filter):          {ms:10.1f} ms")
+
+        for offset in (0, args.rows // 2, args.rows - args.limit):
+            ms = measure(lambda: offset_page(db, args.baby_profile_id, args.camera_type, offset, args.limit), args.repeat)
+            print(f"OFFSET {offset:>9}:              {ms:10.2f} ms")
+
+        # Filtered to the seeded profile and camera, then unfiltered across all of the user's profiles
+        for label, filters in (
+            ("profile", {"baby_profile_id": args.baby_profile_id, "camera_type": args.camera_type}),
+            ("unfiltered", {}),
+        ):
+            ms = measure(lambda: get_detection_results_page(db, user_id, limit=args.limit, **filters), args.repeat)
+            print(f"{f'keyset page 1 ({label}):':30}{ms:10.2f} ms")
+
+            # Walk consecutive pages; each one should cost the same as the first
+            ms, pages = walk_pages(db, user_id, args.pages, limit=args.limit, **filters)
+            print(f"{f'keyset next ({label}):':30}{ms:10.2f} ms avg over {pages} page(s)")
+    finally:
+        db.rollback()
+        cleanup(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
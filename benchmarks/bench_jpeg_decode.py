@@ -0,0 +1,75 @@
+"""
+Benchmark: JPEG decode cost per frame for the stream pipeline.
+
+Compares a full-resolution decode (plus the resize YOLO would do next) with decoding
+directly at a reduced scale through libjpeg DCT scaling (IMREAD_REDUCED_COLOR_*).
+
+The ESP32 firmware sends 640x480 frames, so with the default INFERENCE_IMAGE_SIZE
+of 640 the reduction factor is 1 and there is no saving; the reduced path only
+pays off when INFERENCE_IMAGE_SIZE is set below 640 (or with larger camera frames).
+
+Usage:
+    python -m benchmarks.bench_jpeg_decode --image frame.jpg --iterations 500
+"""
+import argparse
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.esp32_stream_buffer import ESP32StreamBuffer, reduction_factor
+
+
+# Synthetic VGA frame with some texture, encoded roughly like the ESP32 (quality 12 ~ OpenCV 80)
+def synthetic_jpeg():
+    rng = np.random.default_rng(0)
+    frame = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (7, 7), 0)
+    cv2.rectangle(frame, (200, 150), (400, 350), (30, 200, 60), -1)
+    return cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+
+
+def time_per_frame(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", help="JPEG captured from the camera (defaults to a synthetic VGA frame)")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[640, 320, 160])
+    args = parser.parse_args()
+
+    jpeg = open(args.image, "rb").read() if args.image else synthetic_jpeg()
+    buffer = np.frombuffer(jpeg, dtype=np.uint8)
+    stream = ESP32StreamBuffer("http://unused")
+
+    print(f"JPEG size: {len(jpeg)} bytes")
+    print(f"{'target':>7} | {'factor':>6} | {'full + resize ms':>16} | {'reduced decode ms':>17}")
+    print("-" * 56)
+    for size in args.sizes:
+        factor = reduction_factor(jpeg, size)
+
+        def full_then_resize():
+            frame = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+            scale = size / max(frame.shape[:2])
+            if scale < 1:
+                cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+
+        def reduced():
+            # A new frame id every call so the decode cache never hits
+            stream.frame_id += 1
+            stream.decode(jpeg, stream.frame_id, size)
+
+        full_ms = time_per_frame(full_then_resize, args.iterations)
+        reduced_ms = time_per_frame(reduced, args.iterations)
+        print(f"{size:>7} | {factor:>6} | {full_ms:>16.3f} | {reduced_ms:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: post-processing time per frame for YOLO results with many boxes.
+
+Compares the per-box Python loop formerly used in detect() with the vectorized
+selection in app.utils.detection_postprocess (single frame and batched).
+
+Usage:
+    python -m benchmarks.bench_postprocess --boxes 10 100 1000 --classes 20 --batch 8
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.inference_executor import Detections
+from app.utils.detection_postprocess import select_alerts, select_alerts_batch
+
+
+# Random detections with a realistic mix of low and high confidences
+def make_detections(rng, boxes, classes):
+    xy = rng.uniform(0, 600, (boxes, 2)).astype(np.float32)
+    xyxy = np.hstack([xy, xy + rng.uniform(10, 100, (boxes, 2)).astype(np.float32)])
+    return Detections(xyxy, rng.uniform(0, 1, boxes).astype(np.float32), rng.integers(0, classes, boxes))
+
+
+# Baseline: iterate over boxes, as detect() did before vectorization
+def python_loop(detections, thresholds, blocked):
+    alerted = set()
+    picks = []
+    for index, (xyxy, conf, cls) in enumerate(zip(detections.xyxy, detections.conf, detections.cls)):
+        class_id = int(cls)
+        if float(conf) > thresholds[class_id] and not blocked[class_id] and class_id not in alerted:
+            alerted.add(class_id)
+            picks.append(index)
+    return picks
+
+
+def measure(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boxes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=8, help="Frames per batch for the batched measurement")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    thresholds = rng.uniform(0.3, 0.8, args.classes)
+    blocked = rng.uniform(0, 1, args.classes) < 0.2
+
+    print(f"{'boxes':>6} | {'loop us/frame':>13} | {'vector us/frame':>15} | {'batched us/frame':>16}")
+    print("-" * 62)
+    for count in args.boxes:
+        frames = [make_detections(rng, count, args.classes) for _ in range(args.batch)]
+        loop_us = measure(lambda: python_loop(frames[0], thresholds, blocked), args.repeat)
+        vector_us = measure(lambda: select_alerts(frames[0], thresholds, blocked), args.repeat)
+        batched_us = measure(lambda: select_alerts_batch(frames, thresholds, blocked), args.repeat) / args.batch
+        print(f"{count:>6} | {loop_us:>13.1f} | {vector_us:>15.1f} | {batched_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Rebuilds the detection_stats_hourly rollup from the raw detection_results table.
+
+Run once after applying the migration that creates the rollup, and whenever the
+rollup needs to be recomputed (for one profile or for everyone). Detection writes
+wait while the rebuild runs, so nothing is counted twice or missed.
+
+Usage:
+    python -m database.backfill_detection_stats
+    python -m database.backfill_detection_stats --baby-profile-id 12
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Register the models referenced by detection results and the rollup
+import app.models.user_model
+import app.models.baby_profile_model
+import app.models.class_model
+from app.db_utils.detection_stats_utils import rebuild_detection_stats
+from database.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baby-profile-id", type=int, help="Only rebuild this profile's buckets")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        buckets = rebuild_detection_stats(db, args.baby_profile_id)
+    finally:
+        db.close()
+    scope = f"baby profile {args.baby_profile_id}" if args.baby_profile_id is not None else "all profiles"
+    print(f"[INFO] Rebuilt {buckets} hourly detection buckets for {scope}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from app.models.base import Base  # Import only the declarative Base, models are imported elsewhere
+from app.utils.config import config
+from database.pool_metrics import InstrumentedQueuePool, instrument_engine, pool_stats
 
 # Load environment variables from .env file
 load_dotenv()
@@ -19,12 +21,43 @@ DATABASE_URL = (
 
 print("🔧 DATABASE_URL =", DATABASE_URL)
 
+# Pool settings shared by both engines; statement_timeout is set per connection through libpq options
+def _engine_options(pool_size, max_overflow, pool_timeout):
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if config.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
 # Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = instrument_engine(create_engine(
+    DATABASE_URL, **_engine_options(config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW, config.DB_POOL_TIMEOUT)
+))
 
 # Create a configured "SessionLocal" class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Separate, explicitly sized engine for the detection runtime, so camera loops can't starve API requests (and vice versa).
+# Detection code opens a short-lived session from it for each unit of work instead of holding one for hours.
+detection_engine = instrument_engine(create_engine(
+    DATABASE_URL,
+    **_engine_options(config.DETECTION_DB_POOL_SIZE, config.DETECTION_DB_MAX_OVERFLOW, config.DETECTION_DB_POOL_TIMEOUT)
+))
+DetectionSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=detection_engine)
+
+# Snapshot of both connection pools for monitoring
+def db_pool_stats():
+    return {
+        "api": pool_stats(engine),
+        "detection": pool_stats(detection_engine),
+    }
+
 # Dependency that provides a database session to FastAPI routes/services
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,109 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait for a connection, how often the
+    pool has to open overflow connections and how often checkouts time out or fail.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        except Exception:
+            # e.g. the database refused a new connection; not a sign the pool is too small
+            self.metrics.record_error()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.overflow() > 0)
+        return connection
+
+    def recreate(self):
+        # Keep the same counters when SQLAlchemy rebuilds the pool (e.g. after engine.dispose())
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class PoolMetrics:
+    """Counters for one connection pool, updated from any thread."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_checkouts = 0  # Checkouts made while the pool was past pool_size
+        self.timeouts = 0  # Checkouts that failed waiting for a free connection
+        self.checkout_errors = 0  # Checkouts that failed for any other reason (e.g. connect errors)
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if overflowed:
+                self.overflow_checkouts += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_error(self):
+        with self._lock:
+            self.checkout_errors += 1
+
+    def connection_out(self):
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def connection_in(self):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+
+# Attach checkout/checkin listeners that keep the in-use count of an engine's pool
+def instrument_engine(engine):
+    metrics = engine.pool.metrics
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.connection_out()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.connection_in()
+
+    return engine
+
+
+# Snapshot of an instrumented engine's pool for monitoring
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    metrics = pool.metrics
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "in_use": metrics.in_use,
+        "peak_in_use": metrics.peak_in_use,
+        "checkouts": metrics.checkouts,
+        "overflow_checkouts": metrics.overflow_checkouts,
+        "timeouts": metrics.timeouts,
+        "checkout_errors": metrics.checkout_errors,
+        "avg_checkout_ms": round(metrics.total_wait / metrics.checkouts * 1000, 3) if metrics.checkouts else 0.0,
+        "max_checkout_ms": round(metrics.max_wait * 1000, 3),
+    }
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.services import training_monitor_service
+from app.services import cleanup_job_service
 from app.routes.auth_routes import router as auth_router
 from app.routes.user_routes import router as user_router
 from app.routes.model_update_routes import router as model_update_router
@@ -14,6 +15,8 @@ from app.routes import realtime_routes
 from app.routes import class_routes
 from app.routes import class_suggestion_routes
 from database.init_db import init_db
+from app.utils.alert_pipeline import alert_pipeline
+from app.utils.detection_writer import detection_writer
 import sys
 import os
 from fastapi.openapi.utils import get_openapi
@@ -27,6 +30,9 @@ app = FastAPI()
 # Start background thread for monitoring when model training finishes
 training_monitor_service.start_monitoring_thread()
 
+# Start background thread that removes files and Drive folders left by deleted profiles
+cleanup_job_service.start_cleanup_thread()
+
 # Custom OpenAPI schema with JWT bearer authentication added
 def custom_openapi():
     if app.openapi_schema:
@@ -71,6 +77,12 @@ app.add_middleware(
 # Initialize database (create tables if needed)
 init_db()
 
+# Deliver alerts still queued by the detection loops, then write any buffered detections, before the process exits
+@app.on_event("shutdown")
+async def drain_alert_pipeline():
+    await alert_pipeline.shutdown()
+    await detection_writer.close()
+
 # Include API routes from the routes directory
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(user_router)
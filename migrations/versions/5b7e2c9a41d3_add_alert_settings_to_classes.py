@@ -0,0 +1,30 @@
+"""Add per-class alert settings to classes
+
+Revision ID: 5b7e2c9a41d3
+Revises: f35c72c5fd61
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9a41d3'
+down_revision: Union[str, None] = 'f35c72c5fd61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('classes', sa.Column('confidence_threshold', sa.Float(), nullable=True))
+    op.add_column('classes', sa.Column('cooldown_seconds', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('classes', 'cooldown_seconds')
+    op.drop_column('classes', 'confidence_threshold')
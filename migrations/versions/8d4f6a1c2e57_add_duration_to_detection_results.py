@@ -0,0 +1,28 @@
+"""Add duration_seconds to detection_results
+
+Revision ID: 8d4f6a1c2e57
+Revises: 5b7e2c9a41d3
+Create Date: 2026-10-18 11:03:27.504112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f6a1c2e57'
+down_revision: Union[str, None] = '5b7e2c9a41d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('detection_results', sa.Column('duration_seconds', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('detection_results', 'duration_seconds')
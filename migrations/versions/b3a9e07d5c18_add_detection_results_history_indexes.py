@@ -0,0 +1,36 @@
+"""Add composite indexes for detection history pagination
+
+Revision ID: b3a9e07d5c18
+Revises: 8d4f6a1c2e57
+Create Date: 2026-10-18 12:20:08.771935
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3a9e07d5c18'
+down_revision: Union[str, None] = '8d4f6a1c2e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_detection_results_profile_camera_ts', 'detection_results',
+        ['baby_profile_id', 'camera_type', 'timestamp', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_detection_results_profile_ts', 'detection_results',
+        ['baby_profile_id', 'timestamp', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_detection_results_profile_ts', table_name='detection_results')
+    op.drop_index('ix_detection_results_profile_camera_ts', table_name='detection_results')
@@ -0,0 +1,42 @@
+"""Add detection_stats_hourly rollup table
+
+Revision ID: c71e4d2b9f03
+Revises: b3a9e07d5c18
+Create Date: 2026-10-18 13:02:41.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e4d2b9f03'
+down_revision: Union[str, None] = 'b3a9e07d5c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('detection_stats_hourly',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('baby_profile_id', sa.Integer(), nullable=False),
+    sa.Column('camera_type', sa.String(), nullable=False),
+    sa.Column('class_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('confidence_sum', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['baby_profile_id'], ['baby_profiles.id'], ),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('baby_profile_id', 'camera_type', 'class_id', 'bucket_start', name='uq_detection_stats_bucket')
+    )
+    op.create_index(op.f('ix_detection_stats_hourly_id'), 'detection_stats_hourly', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_detection_stats_hourly_id'), table_name='detection_stats_hourly')
+    op.drop_table('detection_stats_hourly')
@@ -0,0 +1,41 @@
+"""Add cleanup_jobs table
+
+Revision ID: d2f8a6b4c193
+Revises: c71e4d2b9f03
+Create Date: 2026-10-18 14:10:52.640219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8a6b4c193'
+down_revision: Union[str, None] = 'c71e4d2b9f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cleanup_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('target', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('run_after', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cleanup_jobs_id'), 'cleanup_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_cleanup_jobs_run_after'), 'cleanup_jobs', ['run_after'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cleanup_jobs_run_after'), table_name='cleanup_jobs')
+    op.drop_index(op.f('ix_cleanup_jobs_id'), table_name='cleanup_jobs')
+    op.drop_table('cleanup_jobs')
@@ -0,0 +1,92 @@
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every model on Base)
+from app.models.base import Base
+from app.models.baby_profile_model import BabyProfile
+from app.models.class_model import ClassObject
+from app.models.detection_result_model import DetectionResult
+from app.models.user_model import User
+from app.services.detection_result_service import _decode_cursor, _encode_cursor, get_detection_results_page
+
+
+def test_cursor_round_trip():
+    """A cursor decodes back to the exact timestamp and id, microseconds included"""
+    timestamp = datetime(2026, 3, 14, 15, 9, 26, 535897)
+    assert _decode_cursor(_encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+
+def test_cursor_is_url_safe():
+    """Cursors can be passed in a query string without escaping"""
+    cursor = _encode_cursor(datetime(2026, 1, 1, 23, 59, 59, 999999), 2 ** 31 - 1)
+    assert all(c.isalnum() or c in "-_=" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["", "zzz", "not base64!", _encode_cursor(datetime(2026, 1, 1), 1)[:-4]])
+def test_invalid_cursor(cursor):
+    """Malformed cursors are rejected with a 400"""
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_decode_rejects_bad_fields():
+    """Cursors with a non-ISO timestamp or a non-numeric id are rejected"""
+    for payload in ("yesterday|1", "2026-01-01T00:00:00|abc", "2026-01-01T00:00:00"):
+        with pytest.raises(HTTPException):
+            _decode_cursor(base64.urlsafe_b64encode(payload.encode()).decode())
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([User(id=1, username="a", email="a@a", hashed_password="x"),
+                     User(id=2, username="b", email="b@b", hashed_password="x")])
+    session.flush()
+    session.add_all([BabyProfile(id=profile_id, user_id=user_id, name=f"P{profile_id}")
+                     for profile_id, user_id in ((1, 1), (2, 1), (3, 2))])
+    session.flush()
+    session.add_all([ClassObject(id=profile_id, name="knife", risk_level="high", camera_type="head_camera",
+                                 baby_profile_id=profile_id) for profile_id in (1, 2, 3)])
+    # Interleaved timestamps across profiles, with ties that only the id can order
+    start = datetime(2026, 1, 1)
+    for i in range(30):
+        profile_id = (1, 2, 3)[i % 3]
+        session.add(DetectionResult(baby_profile_id=profile_id, class_id=profile_id, class_name="knife",
+                                    confidence=0.9, camera_type="head_camera",
+                                    timestamp=start + timedelta(minutes=i // 4), image_path="p"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def walk(db, user_id, **filters):
+    ids, cursor = [], None
+    while True:
+        page = get_detection_results_page(db, user_id, cursor=cursor, **filters)
+        ids += [item.id for item in page.items]
+        cursor = page.next_cursor
+        if not page.has_more:
+            assert cursor is None
+            return ids
+
+
+def test_page_walk_across_profiles(db):
+    """Walking every page returns each of the user's detections once, newest first"""
+    expected = [row.id for row in db.query(DetectionResult).filter(DetectionResult.baby_profile_id.in_([1, 2])).order_by(
+        DetectionResult.timestamp.desc(), DetectionResult.id.desc())]
+    for limit in (1, 3, 7, 100):
+        assert walk(db, 1, limit=limit) == expected
+
+
+def test_page_scoped_to_owner(db):
+    """A profile of another user yields an empty page"""
+    assert walk(db, 1, baby_profile_id=3, limit=5) == []
+    assert len(walk(db, 2, baby_profile_id=3, limit=5)) == 10
@@ -0,0 +1,67 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from app.db_utils.detection_stats_utils import _bucket_totals, hour_bucket
+
+
+def detection(profile_id=1, camera_type="head_camera", class_id=1, timestamp=datetime(2026, 1, 1, 10, 15), confidence=0.5):
+    return {
+        "baby_profile_id": profile_id,
+        "camera_type": camera_type,
+        "class_id": class_id,
+        "timestamp": timestamp,
+        "confidence": confidence,
+    }
+
+
+def test_hour_bucket():
+    """Timestamps are truncated to the start of their hour"""
+    assert hour_bucket(datetime(2026, 1, 1, 10, 59, 59, 999999)) == datetime(2026, 1, 1, 10)
+    assert hour_bucket(datetime(2026, 1, 1, 11)) == datetime(2026, 1, 1, 11)
+
+
+def test_same_hour_is_summed():
+    """Detections of one camera and class within an hour share a bucket"""
+    totals = _bucket_totals([
+        detection(timestamp=datetime(2026, 1, 1, 10, 0), confidence=0.5),
+        detection(timestamp=datetime(2026, 1, 1, 10, 59), confidence=0.25),
+    ])
+    assert len(totals) == 1
+    key, (count, confidence_sum) = totals[0]
+    assert key == (1, "head_camera", 1, datetime(2026, 1, 1, 10))
+    assert count == 2
+    assert confidence_sum == pytest.approx(0.75)
+
+
+def test_each_key_field_splits_buckets():
+    """A different profile, camera, class or hour gives a separate bucket"""
+    rows = [
+        detection(),
+        detection(profile_id=2),
+        detection(camera_type="static_camera"),
+        detection(class_id=2),
+        detection(timestamp=datetime(2026, 1, 1, 11, 15)),
+    ]
+    totals = _bucket_totals(rows)
+    assert len(totals) == 5
+    assert all(count == 1 for _, (count, _) in totals)
+
+
+def test_objects_and_dicts_agree():
+    """ORM-like objects are summed the same way as dicts"""
+    rows = [detection(class_id=2), detection(confidence=0.75)]
+    assert _bucket_totals([SimpleNamespace(**row) for row in rows]) == _bucket_totals(rows)
+
+
+def test_buckets_are_sorted():
+    """Buckets come out in key order so concurrent writers lock rows in the same order"""
+    rows = [detection(profile_id=profile_id, class_id=class_id) for profile_id in (3, 1, 2) for class_id in (2, 1)]
+    keys = [key for key, _ in _bucket_totals(rows)]
+    assert keys == sorted(keys)
+    assert keys[0][:3] == (1, "head_camera", 1)
+
+
+def test_empty():
+    """No rows, no buckets"""
+    assert _bucket_totals([]) == []
@@ -0,0 +1,124 @@
+import asyncio
+import os
+from datetime import datetime
+
+# database.database builds the PostgreSQL URL at import time; the tests swap in SQLite sessions
+for name, value in {"DB_USERNAME": "test", "DB_PASSWORD": "test", "DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "test"}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every model on Base)
+from app.db_utils import detection_stats_utils
+from app.models.base import Base
+from app.models.baby_profile_model import BabyProfile
+from app.models.class_model import ClassObject
+from app.models.detection_result_model import DetectionResult
+from app.models.detection_stats_model import DetectionStatsHourly
+from app.models.user_model import User
+from app.utils import detection_writer
+from app.utils.detection_writer import DetectionWriter
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    # Foreign keys on, and let SQLAlchemy issue BEGIN itself so savepoints work with pysqlite
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    # Report executemany row counts like psycopg2 does, so updates of missing rows behave as on PostgreSQL
+    engine.dialect.supports_sane_multi_rowcount = True
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(User(id=1, username="a", email="a@a", hashed_password="x"))
+        db.flush()
+        db.add(BabyProfile(id=1, user_id=1, name="Ann"))
+        db.flush()
+        db.add(ClassObject(id=1, name="knife", risk_level="high", camera_type="head_camera", baby_profile_id=1))
+        db.commit()
+
+    monkeypatch.setattr(detection_writer, "DetectionSessionLocal", factory)
+    monkeypatch.setattr(detection_stats_utils, "insert", sqlite.insert)  # Same ON CONFLICT upsert, SQLite dialect
+    return factory
+
+
+def detection(class_id=1):
+    return {
+        "baby_profile_id": 1,
+        "class_id": class_id,
+        "class_name": "knife",
+        "confidence": 0.5,
+        "camera_type": "head_camera",
+        "timestamp": datetime(2026, 1, 1, 10, 5),
+        "image_path": "detections/1/a.jpg",
+    }
+
+
+def count_rows(factory):
+    with factory() as db:
+        detections = db.scalar(select(func.count()).select_from(DetectionResult))
+        stats = db.scalar(select(func.coalesce(func.sum(DetectionStatsHourly.count), 0)))
+    return detections, stats
+
+
+async def test_batch_insert(session_factory):
+    """Rows buffered together are written in one flush and get distinct ids"""
+    writer = DetectionWriter(batch_size=10, flush_interval=0.01)
+    ids = await asyncio.gather(*(writer.insert(detection()) for _ in range(4)))
+    assert len(set(ids)) == 4
+    assert writer.stats()["flushes"] == 1
+    assert count_rows(session_factory) == (4, 4)
+
+
+async def test_rejected_row_does_not_fail_batch(session_factory):
+    """A row violating a foreign key is dropped alone; the rest of the batch is stored"""
+    writer = DetectionWriter(batch_size=10, flush_interval=0.01)
+    results = await asyncio.gather(*(writer.insert(detection(class_id)) for class_id in (1, 99, 1)), return_exceptions=True)
+    assert isinstance(results[1], Exception)
+    assert all(isinstance(result, int) for result in (results[0], results[2]))
+    assert writer.stats()["rejected_rows"] == 1
+    assert count_rows(session_factory) == (2, 2)
+
+
+async def test_duration_for_deleted_detection(session_factory):
+    """A duration update for a detection deleted meanwhile is skipped without failing the flush"""
+    writer = DetectionWriter(batch_size=10, flush_interval=0.01)
+    # Delete the older of two rows, so SQLite can't hand its id out again
+    deleted_id, kept_id = await asyncio.gather(writer.insert(detection()), writer.insert(detection()))
+    with session_factory() as db:
+        db.query(DetectionResult).filter(DetectionResult.id == deleted_id).delete()
+        db.commit()
+
+    results = await asyncio.gather(
+        writer.insert(detection()),
+        writer.update_duration(deleted_id, 3.0),
+        writer.update_duration(kept_id, 4.0),
+        writer.insert(detection()),
+    )
+    assert all(isinstance(result, int) for result in (results[0], results[3]))
+    assert writer.stats()["failed_flushes"] == 0
+    with session_factory() as db:
+        assert db.scalar(select(func.count()).select_from(DetectionResult)) == 3
+        assert db.get(DetectionResult, kept_id).duration_seconds == 4.0
+
+
+async def test_duration_update(session_factory):
+    """Durations are stored on existing detections"""
+    writer = DetectionWriter(batch_size=10, flush_interval=0.01)
+    detection_id = await writer.insert(detection())
+    await writer.update_duration(detection_id, 2.5)
+    with session_factory() as db:
+        assert db.get(DetectionResult, detection_id).duration_seconds == 2.5
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+from app.utils.mjpeg_parser import MJPEGParser, parse_boundary, read_jpeg_size
+
+
+def make_jpeg(width, height, value=0):
+    ok, encoded = cv2.imencode(".jpg", np.full((height, width, 3), value, dtype=np.uint8))
+    assert ok
+    return encoded.tobytes()
+
+
+def part(jpeg, boundary=b"frame", with_length=True):
+    headers = b"Content-Type: image/jpeg\r\n"
+    if with_length:
+        headers += b"Content-Length: " + str(len(jpeg)).encode() + b"\r\n"
+    return b"--" + boundary + b"\r\n" + headers + b"\r\n" + jpeg + b"\r\n"
+
+
+def feed_in_chunks(parser, data, size):
+    images = []
+    for start in range(0, len(data), size):
+        images += parser.feed(data[start:start + size])
+    return images
+
+
+def test_parse_boundary():
+    """Boundary is read from the Content-Type header, with or without quotes and leading dashes"""
+    assert parse_boundary("multipart/x-mixed-replace;boundary=123456789000000000000987654321") == b"123456789000000000000987654321"
+    assert parse_boundary('multipart/x-mixed-replace; boundary="--frame"') == b"frame"
+    assert parse_boundary("image/jpeg") is None
+    assert parse_boundary(None) is None
+
+
+def test_content_length_parts():
+    """Parts with a Content-Length header are cut at the announced length"""
+    jpegs = [make_jpeg(32, 24, value) for value in (0, 128, 255)]
+    parser = MJPEGParser(b"frame")
+    assert parser.feed(b"".join(part(jpeg) for jpeg in jpegs)) == jpegs
+
+
+def test_boundary_only_parts():
+    """Without Content-Length, a part ends at the next boundary"""
+    jpegs = [make_jpeg(32, 24, value) for value in (0, 255)]
+    parser = MJPEGParser(b"frame")
+    images = parser.feed(b"".join(part(jpeg, with_length=False) for jpeg in jpegs))
+    # The last part is only complete once the next boundary arrives
+    assert images == jpegs[:1]
+    assert parser.feed(b"--frame\r\n") == jpegs[1:]
+
+
+def test_chunk_splits_at_any_offset():
+    """The same images come out whatever the read size, with and without Content-Length"""
+    jpegs = [make_jpeg(40, 30, value) for value in (10, 90, 170, 250)]
+    for with_length in (True, False):
+        stream = b"".join(part(jpeg, with_length=with_length) for jpeg in jpegs) + b"--frame\r\n"
+        for size in (1, 2, 7, 64, 333, len(stream)):
+            assert feed_in_chunks(MJPEGParser(b"frame"), stream, size) == jpegs, (with_length, size)
+
+
+def test_non_jpeg_parts_are_skipped():
+    """Parts that don't start with the JPEG SOI marker are dropped"""
+    jpeg = make_jpeg(16, 16)
+    parser = MJPEGParser(b"frame")
+    assert parser.feed(part(b"not a jpeg") + part(jpeg)) == [jpeg]
+
+
+def test_overflow_resync():
+    """A part that never completes is discarded, and parsing resumes with the next full part"""
+    jpeg = make_jpeg(16, 16)
+    parser = MJPEGParser(b"frame", max_buffer_bytes=1024)
+    # Announces far more bytes than will ever arrive
+    assert parser.feed(b"--frame\r\nContent-Length: 1000000\r\n\r\n\xff\xd8" + b"\x00" * 2000) == []
+    assert parser.feed(part(jpeg)) == [jpeg]
+
+
+def test_read_jpeg_size():
+    """Width and height are read from the frame header without decoding"""
+    assert read_jpeg_size(make_jpeg(640, 480)) == (640, 480)
+    assert read_jpeg_size(make_jpeg(37, 11)) == (37, 11)
+
+
+def test_read_jpeg_size_invalid():
+    """Truncated or non-JPEG data returns None"""
+    jpeg = make_jpeg(64, 48)
+    assert read_jpeg_size(b"") is None
+    assert read_jpeg_size(jpeg[:20]) is None
+    assert read_jpeg_size(b"\xff\xd8" + b"\x00" * 100) is None